@@ -1,26 +1,43 @@
 """API route handlers."""
 
+import asyncio
+import functools
 import logging
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, HTTPException, Response
 
 from anonymize_api import __version__
 from anonymize_api.api.schemas import (
+    AnalyzeBatchRequest,
+    AnalyzeBatchResponse,
     AnalyzeRequest,
     AnalyzeResponse,
     AnonymizeRequest,
     AnonymizeResponse,
     ConfigResponse,
     ConfigUpdate,
-    DetectedEntity,
     EntitiesResponse,
     EntityInfo,
     HealthResponse,
     NlpEngineInfo,
     NlpEngineResponse,
     NlpEngineUpdate,
+    StatsResponse,
 )
-from anonymize_api.core.analyzer import get_analyzer, get_supported_entities, switch_engine
+from anonymize_api.core.analyzer import (
+    EXECUTOR,
+    analyze_many,
+    analyze_patterns,
+    get_analyzer_status,
+    get_supported_entities,
+    is_analyzer_loaded,
+    resolve_entities,
+    switch_engine,
+)
+from anonymize_api.core.batching import analyze_batcher
+from anonymize_api.core.cache import analyze_cache
 from anonymize_api.core.config import NlpEngineType
 from anonymize_api.core.anonymizer import anonymize_text
 from anonymize_api.core.config import settings
@@ -30,20 +47,61 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _to_detected_entities(
+    text: str,
+    results: list,
+    seen_types: Optional[set[str]] = None,
+) -> list[dict]:
+    """Convert analyzer results to the response format.
+
+    The values come straight from Presidio and already have the right types,
+    so the entities are built as plain dicts in the shape of DetectedEntity
+    instead of a model per entity. If ``seen_types`` is given, the entity
+    types are collected into it on the same pass.
+    """
+    detected_entities = []
+    for result in results:
+        detected_entities.append(
+            {
+                "entity_type": result.entity_type,
+                "text": text[result.start : result.end],
+                "start": result.start,
+                "end": result.end,
+                "score": result.score,
+            }
+        )
+        if seen_types is not None:
+            seen_types.add(result.entity_type)
+
+    return detected_entities
+
+
+def _json_response(content: dict) -> Response:
+    """Serialize a response body in the shape of its response model with orjson.
+
+    Returning a ready Response skips FastAPI's validation of the body against
+    the response model, and orjson encodes plain dicts several times faster
+    than pydantic builds and serializes the models, which dominates for
+    responses with many entities.
+    """
+    # Scores from the transformers engine can be NumPy floats
+    return Response(
+        content=orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY),
+        media_type="application/json",
+    )
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
-    """Check if the service is healthy and the model is loaded."""
-    try:
-        # This will load the model if not already loaded
-        analyzer = get_analyzer()
-        model_loaded = analyzer is not None
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        model_loaded = False
+    """Check if the service is healthy and the model is loaded.
 
+    The model is not loaded here: the app polls this endpoint while the
+    server starts, and loading it would block the event loop. The status is
+    "loading" until the analyzer exists and "unhealthy" if creating it failed.
+    """
     return HealthResponse(
-        status="healthy" if model_loaded else "unhealthy",
-        model_loaded=model_loaded,
+        status=get_analyzer_status(),
+        model_loaded=is_analyzer_loaded(),
         version=__version__,
     )
 
@@ -51,99 +109,131 @@ async def health_check() -> HealthResponse:
 @router.get("/entities", response_model=EntitiesResponse)
 async def list_entities() -> EntitiesResponse:
     """List all available entity types."""
-    entities = get_supported_entities()
+    # Loads the model on first use, so off the event loop
+    entities = await asyncio.get_running_loop().run_in_executor(
+        EXECUTOR, get_supported_entities
+    )
     return EntitiesResponse(
         entities=[EntityInfo(**e) for e in entities],
     )
 
 
 @router.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_text(request: AnalyzeRequest) -> AnalyzeResponse:
-    """Analyze text and return detected PII entities."""
-    analyzer = get_analyzer()
+async def analyze_text(request: AnalyzeRequest, fast_mode: bool = False) -> Response:
+    """Analyze text and return detected PII entities.
 
+    With ``fast_mode``, only the Swiss pattern recognizers run, without the
+    NLP model. That is enough for short inputs like a single IBAN or phone
+    number, and doesn't need the model to be loaded.
+    """
     # Determine which entities to look for
-    entities_to_analyze = request.enabled_entities or settings.default_entities
+    entities_to_analyze = resolve_entities(request.enabled_entities)
 
     try:
-        results = analyzer.analyze(
-            text=request.text,
-            entities=entities_to_analyze,
-            language="de",
-            score_threshold=request.score_threshold,
-        )
+        if fast_mode:
+            results = await asyncio.get_running_loop().run_in_executor(
+                EXECUTOR,
+                analyze_patterns,
+                request.text,
+                entities_to_analyze,
+                request.score_threshold,
+            )
+        else:
+            results = await analyze_batcher.analyze(
+                text=request.text,
+                entities=entities_to_analyze,
+                score_threshold=request.score_threshold,
+            )
     except Exception as e:
         logger.error(f"Analysis failed: {e}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
     # Convert results to response format
-    detected_entities = [
-        DetectedEntity(
-            entity_type=result.entity_type,
-            text=request.text[result.start : result.end],
-            start=result.start,
-            end=result.end,
-            score=result.score,
+    detected_entities = _to_detected_entities(request.text, results)
+
+    return _json_response({"text": request.text, "entities": detected_entities})
+
+
+@router.post("/analyze_batch", response_model=AnalyzeBatchResponse)
+async def analyze_batch(request: AnalyzeBatchRequest) -> Response:
+    """Analyze several texts in one batched pass through the NLP pipeline."""
+    texts = [item.text for item in request.items]
+
+    try:
+        results = await asyncio.get_running_loop().run_in_executor(
+            EXECUTOR,
+            analyze_many,
+            texts,
+            [resolve_entities(item.enabled_entities) for item in request.items],
+            [item.score_threshold for item in request.items],
         )
-        for result in results
-    ]
+    except Exception as e:
+        logger.error(f"Batch analysis failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
-    return AnalyzeResponse(
-        text=request.text,
-        entities=detected_entities,
+    return _json_response(
+        {
+            "results": [
+                {"text": text, "entities": _to_detected_entities(text, text_results)}
+                for text, text_results in zip(texts, results)
+            ],
+        }
     )
 
 
 @router.post("/anonymize", response_model=AnonymizeResponse)
-async def anonymize(request: AnonymizeRequest) -> AnonymizeResponse:
+async def anonymize(request: AnonymizeRequest) -> Response:
     """Analyze and anonymize text."""
-    analyzer = get_analyzer()
-
     # Determine which entities to look for
-    entities_to_analyze = request.enabled_entities or settings.default_entities
+    entities_to_analyze = resolve_entities(request.enabled_entities)
 
     try:
-        results = analyzer.analyze(
+        results = await analyze_batcher.analyze(
             text=request.text,
             entities=entities_to_analyze,
-            language="de",
             score_threshold=request.score_threshold,
         )
     except Exception as e:
         logger.error(f"Analysis failed: {e}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
-    # Convert results to response format before anonymization
-    detected_entities = [
-        DetectedEntity(
-            entity_type=result.entity_type,
-            text=request.text[result.start : result.end],
-            start=result.start,
-            end=result.end,
-            score=result.score,
-        )
-        for result in results
-    ]
+    # Convert results to response format before anonymization, collecting
+    # the entity types for the anonymizer on the same pass
+    seen_types: set[str] = set()
+    detected_entities = _to_detected_entities(request.text, results, seen_types)
 
     # Anonymize the text
     try:
-        anonymized = anonymize_text(
-            text=request.text,
-            analyzer_results=results,
-            style=request.anonymization_style,
+        anonymized = await asyncio.get_running_loop().run_in_executor(
+            EXECUTOR,
+            functools.partial(
+                anonymize_text,
+                text=request.text,
+                analyzer_results=results,
+                style=request.anonymization_style,
+                entity_types=seen_types,
+            ),
         )
     except Exception as e:
         logger.error(f"Anonymization failed: {e}")
         raise HTTPException(status_code=500, detail=f"Anonymization failed: {str(e)}")
 
-    return AnonymizeResponse(
-        original_text=request.text,
-        anonymized_text=anonymized,
-        entities=detected_entities,
-        anonymization_style=request.anonymization_style,
+    return _json_response(
+        {
+            "original_text": request.text,
+            "anonymized_text": anonymized,
+            "entities": detected_entities,
+            "anonymization_style": request.anonymization_style,
+        }
     )
 
 
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats() -> StatsResponse:
+    """Get hit/miss statistics of the analyze cache."""
+    return StatsResponse(**analyze_cache.stats())
+
+
 @router.get("/config", response_model=ConfigResponse)
 async def get_config() -> ConfigResponse:
     """Get current configuration."""
@@ -208,7 +298,7 @@ async def set_engine(update: NlpEngineUpdate) -> NlpEngineResponse:
             detail=f"Invalid engine: {update.engine}. Must be 'spacy' or 'transformers'",
         )
 
-    switch_engine(engine_type)
+    await asyncio.get_running_loop().run_in_executor(EXECUTOR, switch_engine, engine_type)
 
     return NlpEngineResponse(
         current=settings.nlp_engine.value,
@@ -21,6 +21,16 @@ class AnalyzeRequest(BaseModel):
     )
 
 
+class AnalyzeBatchRequest(BaseModel):
+    """Request to analyze several texts in a single call."""
+
+    items: list[AnalyzeRequest] = Field(
+        ...,
+        min_length=1,
+        description="Texts to analyze, each with its own entity and threshold settings",
+    )
+
+
 class AnonymizeRequest(BaseModel):
     """Request to anonymize text."""
 
@@ -61,6 +71,15 @@ class AnalyzeResponse(BaseModel):
     )
 
 
+class AnalyzeBatchResponse(BaseModel):
+    """Response from batch text analysis."""
+
+    results: list[AnalyzeResponse] = Field(
+        default_factory=list,
+        description="Analysis results, in the same order as the request items",
+    )
+
+
 class AnonymizeResponse(BaseModel):
     """Response from text anonymization."""
 
@@ -90,11 +109,23 @@ class EntitiesResponse(BaseModel):
 class HealthResponse(BaseModel):
     """Health check response."""
 
-    status: str = Field(..., description="Service status")
+    status: Literal["healthy", "loading", "unhealthy"] = Field(
+        ...,
+        description="Service status (unhealthy if the model failed to load)",
+    )
     model_loaded: bool = Field(..., description="Whether the spaCy model is loaded")
     version: str = Field(..., description="API version")
 
 
+class StatsResponse(BaseModel):
+    """Analyze cache statistics."""
+
+    hits: int = Field(..., description="Analyze calls answered from the cache")
+    misses: int = Field(..., description="Analyze calls that ran the analyzer")
+    size: int = Field(..., description="Number of cached results")
+    maxsize: int = Field(..., description="Maximum number of cached results")
+
+
 class ConfigResponse(BaseModel):
     """Current configuration response."""
 
@@ -1,13 +1,18 @@
 """Presidio analyzer wrapper."""
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from typing import Optional
 
-from presidio_analyzer import AnalyzerEngine
+from presidio_analyzer import AnalyzerEngine, EntityRecognizer, RecognizerResult
 
+from anonymize_api.core.cache import analyze_cache
 from anonymize_api.core.config import NlpEngineType, settings
 from anonymize_api.core.engines import create_nlp_engine
+from anonymize_api.recognizers.context_enhancer import IndexedLemmaContextAwareEnhancer
+from anonymize_api.recognizers.results import remove_duplicates
 from anonymize_api.recognizers.swiss import get_swiss_recognizers
 
 logger = logging.getLogger(__name__)
@@ -15,8 +20,30 @@ logger = logging.getLogger(__name__)
 # Track the current engine type for cache invalidation
 _current_engine_type: Optional[NlpEngineType] = None
 
+# Sample text analyzed once at startup to warm up the pipeline
+_WARM_UP_TEXT = "Max Muster wohnt in 8001 Zürich, Telefon +41 44 123 45 67."
+
+# Worker pool for the blocking NLP and anonymization calls, so they run off
+# the event loop (spaCy and torch release the GIL in their inner loops)
+EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.num_parallel,
+    thread_name_prefix="analyzer",
+)
+
+
+# Analyzer for the current engine type, created on first use. A plain dict
+# keeps the lookup on the request path cheaper than an lru_cache wrapper
+_ANALYZERS: dict[NlpEngineType, AnalyzerEngine] = {}
+
+# Held while an analyzer is created, so requests arriving on several worker
+# threads before it exists load the model only once
+_ANALYZERS_LOCK = threading.Lock()
+
+# Why creating the analyzer for an engine type failed last, reported by
+# /health until a later attempt succeeds
+_LOAD_ERRORS: dict[NlpEngineType, Exception] = {}
+
 
-@lru_cache(maxsize=1)
 def _create_analyzer(engine_type: NlpEngineType) -> AnalyzerEngine:
     """Internal function to create analyzer with specific engine type."""
     logger.info(f"Creating analyzer with engine: {engine_type.value}")
@@ -31,10 +58,11 @@ def _create_analyzer(engine_type: NlpEngineType) -> AnalyzerEngine:
     analyzer = AnalyzerEngine(
         nlp_engine=nlp_engine,
         supported_languages=["de"],
+        context_aware_enhancer=IndexedLemmaContextAwareEnhancer(),
     )
 
     # Add Swiss-specific regex recognizers (always used regardless of engine)
-    for recognizer in get_swiss_recognizers():
+    for recognizer in _create_swiss_recognizers(analyzer):
         analyzer.registry.add_recognizer(recognizer)
         logger.info(f"Added recognizer: {recognizer.supported_entities}")
 
@@ -42,13 +70,175 @@ def _create_analyzer(engine_type: NlpEngineType) -> AnalyzerEngine:
     return analyzer
 
 
+def _create_swiss_recognizers(analyzer: AnalyzerEngine) -> list[EntityRecognizer]:
+    """Create the Swiss recognizers, sharing one Hyperscan scan if available.
+
+    Hyperscan is optional (it has no wheels for every platform); without it
+    the recognizers run their regexes one by one as usual.
+    """
+    recognizers = get_swiss_recognizers()
+
+    try:
+        from anonymize_api.recognizers.hyperscan_recognizer import HyperscanRecognizer
+    except ImportError:
+        logger.info("Hyperscan not installed, using per-recognizer regex matching")
+        return recognizers
+
+    return [
+        HyperscanRecognizer(
+            recognizers,
+            analyzer.context_aware_enhancer,
+            cache_dir=settings.hyperscan_cache_dir,
+        )
+    ]
+
+
 def get_analyzer() -> AnalyzerEngine:
     """Get or create the Presidio analyzer engine.
 
     The analyzer is cached and reused across requests.
     Uses the configured NLP engine (spaCy or Transformers).
     """
-    return _create_analyzer(settings.nlp_engine)
+    return _get_analyzer(settings.nlp_engine)
+
+
+def is_analyzer_loaded() -> bool:
+    """Check if the analyzer for the configured engine has been created."""
+    return settings.nlp_engine in _ANALYZERS
+
+
+def get_analyzer_status() -> str:
+    """Get the state of the analyzer for the configured engine.
+
+    Returns "healthy" once it has been created, "unhealthy" if creating it
+    failed, and "loading" before that (including while an engine switch
+    or a first request loads it).
+    """
+    if settings.nlp_engine in _ANALYZERS:
+        return "healthy"
+    if settings.nlp_engine in _LOAD_ERRORS:
+        return "unhealthy"
+    return "loading"
+
+
+def _get_analyzer(engine_type: NlpEngineType) -> AnalyzerEngine:
+    """Internal function to get the cached analyzer for an engine type."""
+    analyzer = _ANALYZERS.get(engine_type)
+    if analyzer is None:
+        with _ANALYZERS_LOCK:
+            analyzer = _ANALYZERS.get(engine_type)
+            if analyzer is None:
+                try:
+                    analyzer = _ANALYZERS[engine_type] = _create_analyzer(engine_type)
+                except Exception as e:
+                    _LOAD_ERRORS[engine_type] = e
+                    raise
+                _LOAD_ERRORS.pop(engine_type, None)
+    return analyzer
+
+
+def resolve_entities(enabled_entities: Optional[list[str]]) -> frozenset[str]:
+    """Get the entity types to detect for a request.
+
+    Falls back to the default entities when none are given. The sets are
+    cached, so requests with the same selection reuse one frozenset instead
+    of building a new collection each time.
+    """
+    return _entity_set(tuple(enabled_entities or settings.default_entities))
+
+
+@lru_cache(maxsize=128)
+def _entity_set(entities: tuple[str, ...]) -> frozenset[str]:
+    """Internal function to build the cached entity set."""
+    return frozenset(entities)
+
+
+def warm_up() -> None:
+    """Run a dummy analysis so the first real request hits a warm pipeline.
+
+    This forces the lazy initialization inside spaCy (vocab and string
+    store growth) and the recognizers (regex compilation) at startup.
+    """
+    get_analyzer().analyze(
+        text=_WARM_UP_TEXT,
+        entities=resolve_entities(None),
+        language="de",
+    )
+
+
+def analyze_patterns(
+    text: str,
+    entities: frozenset[str],
+    score_threshold: float,
+) -> list[RecognizerResult]:
+    """Analyze a text with the Swiss pattern recognizers only.
+
+    The NLP pipeline is skipped entirely, so the model doesn't have to be
+    loaded, and only the Swiss entity types are detected. Without NLP
+    artifacts there are no context words either, so patterns that rely on
+    them (like postal codes) keep their base score.
+    """
+    results = []
+    for recognizer in get_swiss_recognizers():
+        if not entities.isdisjoint(recognizer.supported_entities):
+            results.extend(recognizer.analyze(text, list(entities)))
+
+    return [
+        result
+        for result in remove_duplicates(results)
+        if result.score >= score_threshold
+    ]
+
+
+def analyze_many(
+    texts: list[str],
+    entities: list[frozenset[str]],
+    score_thresholds: list[float],
+) -> list[list[RecognizerResult]]:
+    """Analyze several texts with one batched pass through the NLP pipeline.
+
+    The texts are processed together via spaCy's ``nlp.pipe`` so the model
+    runs on whole batches instead of one text at a time. The recognizers
+    then run per document on the precomputed NLP artifacts. Texts analyzed
+    before with the same settings are answered from the analyze cache.
+
+    Args:
+        texts: Texts to analyze
+        entities: Entity types to detect, one list per text
+        score_thresholds: Minimum confidence score, one per text
+
+    Returns:
+        The analyzer results for each text, in input order
+    """
+    analyzer = get_analyzer()
+
+    # Serve repeated texts from the cache, only the rest go through the model
+    keys = [
+        analyze_cache.key(text, text_entities, score_threshold)
+        for text, text_entities, score_threshold in zip(texts, entities, score_thresholds)
+    ]
+    results = [analyze_cache.get(key) for key in keys]
+    misses = [i for i, cached in enumerate(results) if cached is None]
+    if not misses:
+        return results
+
+    processed = analyzer.nlp_engine.process_batch(
+        [texts[i] for i in misses],
+        language="de",
+        batch_size=settings.batch_max_size,
+    )
+
+    for i, (text, nlp_artifacts) in zip(misses, processed):
+        results[i] = analyzer.analyze(
+            text=text,
+            entities=entities[i],
+            language="de",
+            score_threshold=score_thresholds[i],
+            nlp_artifacts=nlp_artifacts,
+        )
+        analyze_cache.put(keys[i], results[i])
+
+    return results
 
 
 def switch_engine(engine_type: NlpEngineType) -> None:
@@ -68,54 +258,79 @@ def switch_engine(engine_type: NlpEngineType) -> None:
     # Update settings
     settings.nlp_engine = engine_type
 
-    # Clear the analyzer cache
-    _create_analyzer.cache_clear()
+    # Clear the analyzer, supported entities and results caches
+    with _ANALYZERS_LOCK:
+        _ANALYZERS.clear()
+        _LOAD_ERRORS.clear()
+    _supported_entities.cache_clear()
+    analyze_cache.clear()
 
     # Pre-create the new analyzer
-    _create_analyzer(engine_type)
+    _get_analyzer(engine_type)
 
     _current_engine_type = engine_type
     logger.info(f"Successfully switched to {engine_type.value} engine")
 
 
 def get_supported_entities() -> list[dict]:
-    """Get list of supported entity types with descriptions."""
-    analyzer = get_analyzer()
+    """Get list of supported entity types with descriptions.
+
+    The list only changes when the recognizers change, so it is computed
+    once per engine and cached.
+    """
+    return list(_supported_entities(settings.nlp_engine))
+
+
+@lru_cache(maxsize=4)
+def _supported_entities(engine_type: NlpEngineType) -> tuple[dict, ...]:
+    """Internal function to collect the entities supported by an engine."""
+    analyzer = _get_analyzer(engine_type)
     recognizers = analyzer.registry.get_recognizers(language="de", all_fields=True)
 
-    entities = {}
+    seen: set[str] = set()
+    entities = []
     for recognizer in recognizers:
         for entity in recognizer.supported_entities:
-            if entity not in entities:
-                entities[entity] = {
-                    "type": entity,
-                    "description": _get_entity_description(entity),
-                    "is_swiss": entity.startswith("CH_"),
-                }
+            if entity in seen:
+                continue
+            seen.add(entity)
+            entities.append(_build_entity_info(entity))
+
+    return tuple(entities)
+
+
+def _build_entity_info(entity_type: str) -> dict:
+    """Build the description record for a single entity type."""
+    return {
+        "type": entity_type,
+        "description": _get_entity_description(entity_type),
+        "is_swiss": entity_type.startswith("CH_"),
+    }
 
-    return list(entities.values())
+
+# Human-readable descriptions for known entity types
+_ENTITY_DESCRIPTIONS = {
+    "PERSON": "Person names",
+    "EMAIL_ADDRESS": "Email addresses",
+    "PHONE_NUMBER": "Phone numbers",
+    "LOCATION": "Locations and addresses",
+    "DATE_TIME": "Dates and times",
+    "IBAN_CODE": "IBAN bank account numbers",
+    "CREDIT_CARD": "Credit card numbers",
+    "IP_ADDRESS": "IP addresses",
+    "URL": "URLs and web addresses",
+    "CH_AHV": "Swiss AHV/AVS social security numbers",
+    "CH_PHONE": "Swiss phone numbers (+41, 0XX)",
+    "CH_POSTAL_CODE": "Swiss postal codes (PLZ)",
+    "CH_IBAN": "Swiss IBAN numbers",
+    "NRP": "National registration numbers",
+    "MEDICAL_LICENSE": "Medical license numbers",
+    "US_SSN": "US Social Security numbers",
+    "US_PASSPORT": "US passport numbers",
+    "UK_NHS": "UK NHS numbers",
+}
 
 
 def _get_entity_description(entity_type: str) -> str:
     """Get human-readable description for an entity type."""
-    descriptions = {
-        "PERSON": "Person names",
-        "EMAIL_ADDRESS": "Email addresses",
-        "PHONE_NUMBER": "Phone numbers",
-        "LOCATION": "Locations and addresses",
-        "DATE_TIME": "Dates and times",
-        "IBAN_CODE": "IBAN bank account numbers",
-        "CREDIT_CARD": "Credit card numbers",
-        "IP_ADDRESS": "IP addresses",
-        "URL": "URLs and web addresses",
-        "CH_AHV": "Swiss AHV/AVS social security numbers",
-        "CH_PHONE": "Swiss phone numbers (+41, 0XX)",
-        "CH_POSTAL_CODE": "Swiss postal codes (PLZ)",
-        "CH_IBAN": "Swiss IBAN numbers",
-        "NRP": "National registration numbers",
-        "MEDICAL_LICENSE": "Medical license numbers",
-        "US_SSN": "US Social Security numbers",
-        "US_PASSPORT": "US passport numbers",
-        "UK_NHS": "UK NHS numbers",
-    }
-    return descriptions.get(entity_type, f"{entity_type} entities")
+    return _ENTITY_DESCRIPTIONS.get(entity_type, f"{entity_type} entities")
@@ -1,17 +1,32 @@
 """Presidio anonymizer wrapper."""
 
+import hashlib
 import logging
+import os
+from collections.abc import Iterable
 from functools import lru_cache
-from typing import Literal
+from typing import Literal, Optional
 
 from presidio_analyzer import RecognizerResult
 from presidio_anonymizer import AnonymizerEngine
-from presidio_anonymizer.entities import OperatorConfig
+from presidio_anonymizer.entities import ConflictResolutionStrategy, OperatorConfig
+
+from anonymize_api.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 AnonymizationStyle = Literal["replace", "mask", "hash", "redact"]
 
+# Internal AnonymizerEngine steps reused by _rewrite_spans. They are not part
+# of Presidio's public API (the last one was renamed in 2.2.363), so if any is
+# missing the public anonymize() is used instead
+_SPAN_STEPS = (
+    "_copy_recognizer_results",
+    "_remove_conflicts_and_get_text_manipulation_data",
+    "_merge_entities_with_spaces_between",
+)
+_CAN_REWRITE_SPANS = all(hasattr(AnonymizerEngine, step) for step in _SPAN_STEPS)
+
 
 @lru_cache(maxsize=1)
 def get_anonymizer() -> AnonymizerEngine:
@@ -20,52 +35,115 @@ def get_anonymizer() -> AnonymizerEngine:
     return AnonymizerEngine()
 
 
+def _blake2b_hash(text: str) -> str:
+    """Hash text with BLAKE2b and a random salt, like Presidio's hash operator."""
+    return hashlib.blake2b(text.encode() + os.urandom(32), digest_size=32).hexdigest()
+
+
+def _create_hash_operator() -> OperatorConfig:
+    """Create the operator for the configured hash algorithm."""
+    if settings.hash_type == "blake2b":
+        return OperatorConfig("custom", {"lambda": _blake2b_hash})
+
+    return OperatorConfig("hash", {"hash_type": settings.hash_type})
+
+
+class _ReplaceOperators(dict):
+    """Per-entity replace operators, created on first use and then reused."""
+
+    def __missing__(self, entity: str) -> OperatorConfig:
+        operator = self[entity] = OperatorConfig(
+            "replace",
+            {"new_value": f"<{entity}>"},
+        )
+        return operator
+
+
+_REPLACE_OPERATORS = _ReplaceOperators()
+
+# The other styles use the same operator for every entity type, so a single
+# shared "DEFAULT" entry (applied by Presidio to all entities) is enough
+_STYLE_OPERATORS: dict[str, dict[str, OperatorConfig]] = {
+    "mask": {
+        "DEFAULT": OperatorConfig(
+            "mask",
+            {
+                "type": "mask",
+                "masking_char": "*",
+                "chars_to_mask": 100,
+                "from_end": False,
+            },
+        ),
+    },
+    "hash": {
+        "DEFAULT": _create_hash_operator(),
+    },
+    "redact": {
+        "DEFAULT": OperatorConfig("redact"),
+    },
+}
+
+
 def create_operators(
     style: AnonymizationStyle,
-    entities: list[str],
+    entities: Iterable[str],
 ) -> dict[str, OperatorConfig]:
     """Create operator configurations for the specified anonymization style.
 
+    The operator configs are built once and shared between requests.
+
     Args:
         style: The anonymization style to use
-        entities: List of entity types to configure
+        entities: Entity types to configure
 
     Returns:
         Dictionary mapping entity types to operator configurations
     """
-    operators = {}
+    if style == "replace":
+        return {entity: _REPLACE_OPERATORS[entity] for entity in entities}
+
+    return _STYLE_OPERATORS[style]
 
-    for entity in entities:
+
+def _rewrite_spans(
+    anonymizer: AnonymizerEngine,
+    text: str,
+    analyzer_results: list[RecognizerResult],
+    style: AnonymizationStyle,
+) -> str:
+    """Apply the replace or redact style directly to the text.
+
+    Both styles substitute a value that only depends on the entity type, so
+    there is no need for Presidio's per-entity operator lookup, validation
+    and result bookkeeping. Overlapping and adjacent results are resolved
+    with Presidio's own steps, and the text is then rebuilt in one pass, with
+    the same output as ``AnonymizerEngine.anonymize``.
+    """
+    results = anonymizer._copy_recognizer_results(analyzer_results)
+    results.sort(key=lambda x: (x.start, x.end))
+    results = anonymizer._remove_conflicts_and_get_text_manipulation_data(
+        results, ConflictResolutionStrategy.MERGE_SIMILAR_OR_CONTAINED
+    )
+    results = anonymizer._merge_entities_with_spaces_between(text, results)
+
+    # Walk from the end like Presidio, so overlapping spans are cut the same way
+    pieces = []
+    last = len(text)
+    for result in sorted(results, key=lambda r: r.start, reverse=True):
+        pieces.append(text[min(result.end, last) : last])
         if style == "replace":
-            operators[entity] = OperatorConfig(
-                "replace",
-                {"new_value": f"<{entity}>"},
-            )
-        elif style == "mask":
-            operators[entity] = OperatorConfig(
-                "mask",
-                {
-                    "type": "mask",
-                    "masking_char": "*",
-                    "chars_to_mask": 100,
-                    "from_end": False,
-                },
-            )
-        elif style == "hash":
-            operators[entity] = OperatorConfig(
-                "hash",
-                {"hash_type": "sha256"},
-            )
-        elif style == "redact":
-            operators[entity] = OperatorConfig("redact")
-
-    return operators
+            pieces.append(_REPLACE_OPERATORS[result.entity_type].params["new_value"])
+        last = result.start
+    pieces.append(text[:last])
+
+    return "".join(reversed(pieces))
 
 
 def anonymize_text(
     text: str,
     analyzer_results: list[RecognizerResult],
     style: AnonymizationStyle = "replace",
+    entity_types: Optional[Iterable[str]] = None,
 ) -> str:
     """Anonymize text using the specified style.
 
@@ -73,6 +151,8 @@ def anonymize_text(
         text: The original text to anonymize
         analyzer_results: Results from the Presidio analyzer
         style: The anonymization style to use
+        entity_types: The distinct entity types in ``analyzer_results``, if
+            the caller already collected them
 
     Returns:
         The anonymized text
@@ -82,8 +162,12 @@ def anonymize_text(
 
     anonymizer = get_anonymizer()
 
+    if style in ("replace", "redact") and _CAN_REWRITE_SPANS:
+        return _rewrite_spans(anonymizer, text, analyzer_results, style)
+
     # Get unique entity types from results
-    entity_types = list({result.entity_type for result in analyzer_results})
+    if entity_types is None:
+        entity_types = {result.entity_type for result in analyzer_results}
 
     # Create operators for the style
     operators = create_operators(style, entity_types)
@@ -0,0 +1,148 @@
+"""Micro-batching of concurrent analyze requests."""
+
+import asyncio
+import contextlib
+import logging
+from typing import Optional
+
+from presidio_analyzer import RecognizerResult
+
+from anonymize_api.core.analyzer import EXECUTOR, analyze_many
+from anonymize_api.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyzeBatcher:
+    """Coalesce concurrent analyze calls into batched analyzer runs.
+
+    Callers await :meth:`analyze` as if it were a single call. Behind the
+    scenes, requests arriving within ``window`` seconds of the first queued
+    one (up to ``max_batch`` requests) are flushed together through
+    :func:`analyze_many`, so the NLP model runs once per batch instead of
+    once per request. Up to ``max_concurrent`` batches run in parallel.
+    """
+
+    def __init__(self, max_batch: int, window: float, max_concurrent: int) -> None:
+        self.max_batch = max_batch
+        self.window = window
+        self.max_concurrent = max_concurrent
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the background worker if it is not running yet."""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+            logger.info(
+                f"Analyze batcher started (max batch: {self.max_batch}, "
+                f"window: {self.window * 1000:.0f} ms)"
+            )
+
+    async def stop(self) -> None:
+        """Stop the background worker and fail the requests it hasn't answered."""
+        if self._worker is not None:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            while not self._queue.empty():
+                _fail_stopped([self._queue.get_nowait()])
+            self._worker = None
+            self._queue = None
+
+    async def analyze(
+        self,
+        text: str,
+        entities: frozenset[str],
+        score_threshold: float,
+    ) -> list[RecognizerResult]:
+        """Queue a text for analysis and wait for its results."""
+        await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, entities, score_threshold, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Collect queued requests into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_concurrent)
+        # Batches being analyzed, and the one being collected, so their
+        # requests can be failed if the worker is stopped
+        pending: dict[asyncio.Task, list[tuple]] = {}
+        batch: list[tuple] = []
+
+        try:
+            while True:
+                # Wait for a free worker first, so requests keep accumulating
+                # into the next batch while all workers are busy
+                await slots.acquire()
+
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.window
+
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                task = asyncio.create_task(self._analyze_batch(batch))
+                pending[task] = batch
+                task.add_done_callback(pending.pop)
+                task.add_done_callback(lambda _: slots.release())
+                batch = []
+        finally:
+            for task, task_batch in list(pending.items()):
+                task.cancel()
+                _fail_stopped(task_batch)
+            _fail_stopped(batch)
+
+    async def _analyze_batch(self, batch: list[tuple]) -> None:
+        """Analyze one batch in the worker pool and resolve its futures.
+
+        If the batch fails, its texts are analyzed again one by one, so an
+        error only fails the request whose text caused it.
+        """
+        texts, entities, score_thresholds, futures = zip(*batch)
+
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                EXECUTOR,
+                analyze_many,
+                list(texts),
+                list(entities),
+                list(score_thresholds),
+            )
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Analysis failed: {e}")
+                if not futures[0].done():
+                    futures[0].set_exception(e)
+                return
+
+            logger.warning(f"Batch analysis failed, analyzing its texts one by one: {e}")
+            await asyncio.gather(*(self._analyze_batch([item]) for item in batch))
+            return
+
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _fail_stopped(batch: list[tuple]) -> None:
+    """Fail the requests of a batch that won't be analyzed anymore."""
+    for *_, future in batch:
+        if not future.done():
+            future.set_exception(RuntimeError("batcher stopped"))
+
+
+analyze_batcher = AnalyzeBatcher(
+    max_batch=settings.batch_max_size,
+    window=settings.batch_window_ms / 1000,
+    max_concurrent=settings.num_parallel,
+)
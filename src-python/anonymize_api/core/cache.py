@@ -0,0 +1,77 @@
+"""LRU cache of analyzer results for repeated texts."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from presidio_analyzer import RecognizerResult
+
+from anonymize_api.core.config import settings
+
+
+class AnalyzeCache:
+    """Thread-safe LRU cache of analyzer results.
+
+    Entries are keyed by a SHA-256 digest of the text rather than the text
+    itself, so the memory used by the keys stays small for long documents.
+    SHA-256 runs through OpenSSL, which uses the CPU's SHA extensions where
+    available, and hashes faster than hashlib's BLAKE2b there.
+    Results are stored as tuples and handed out as fresh lists, so callers
+    can't change the cached entry.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[RecognizerResult, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str, entities: frozenset[str], score_threshold: float) -> tuple:
+        """Build the cache key for an analyze call with the current engine."""
+        # Lone surrogates are allowed in JSON strings but not in plain UTF-8
+        digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+        return (digest, entities, score_threshold, settings.nlp_engine)
+
+    def get(self, key: tuple) -> Optional[list[RecognizerResult]]:
+        """Get the cached results for a key, or None if not cached."""
+        with self._lock:
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return list(results)
+
+    def put(self, key: tuple, results: list[RecognizerResult]) -> None:
+        """Store results, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = tuple(results)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached results, e.g. after switching the NLP engine."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get the hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+analyze_cache = AnalyzeCache(maxsize=settings.analyze_cache_size)
@@ -1,6 +1,9 @@
 """Application configuration."""
 
+import os
 from enum import Enum
+from pathlib import Path
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -27,9 +30,58 @@ class Settings(BaseSettings):
     # spaCy model for German (used by spacy engine and for tokenization in transformers)
     spacy_model: str = "de_core_news_sm"
 
+    # Where the trimmed copy of the spaCy model (unused pipeline components
+    # removed) is cached between runs
+    spacy_cache_dir: Path = Path.home() / ".cache" / "anonymize" / "spacy"
+
+    # Where the compiled Hyperscan database of the Swiss patterns is cached
+    hyperscan_cache_dir: Path = Path.home() / ".cache" / "anonymize" / "hyperscan"
+
     # Transformers model for NER
     transformers_model: str = "tabularisai/eu-pii-safeguard"
 
+    # Inference backend for the transformers model: "pytorch", or "onnx" to
+    # run an int8-quantized export on ONNX Runtime (needs optimum[onnxruntime])
+    transformers_backend: Literal["pytorch", "onnx"] = "pytorch"
+
+    # Run the transformers model on the GPU: True requires one, False forces
+    # the CPU, unset uses a CUDA/MPS device when one is detected
+    gpu: Optional[bool] = None
+
+    # Texts per forward pass of the transformers model when analyzing batches
+    transformers_batch_size: int = 16
+
+    # Where the quantized ONNX export of the transformers model is cached
+    onnx_cache_dir: Path = Path.home() / ".cache" / "anonymize" / "ort_quantized"
+
+    # Number of server processes. With more than one, the models are loaded
+    # once and the workers are forked from that process, sharing the model
+    # memory copy-on-write. That is Linux only; on macOS and Windows uvicorn
+    # spawns the workers and each loads its own
+    workers: int = 1
+
+    # Number of analyze/anonymize jobs run in parallel off the event loop.
+    # They share one analyzer and NLP pipeline, which only read the model but
+    # share spaCy's vocab and tokenizer caches. spaCy and torch only release
+    # the GIL in their inner loops, so a few threads already keep it busy
+    num_parallel: int = min(4, os.cpu_count() or 1)
+
+    # Hash algorithm for the "hash" anonymization style. sha256/sha512 run
+    # through OpenSSL, which uses the CPU's SHA extensions when available
+    hash_type: Literal["sha256", "sha512", "blake2b"] = "sha256"
+
+    # Micro-batching of concurrent analyze requests: requests arriving within
+    # the window are run through the NLP pipeline together (up to the max size)
+    batch_max_size: int = 32
+    batch_window_ms: float = 10.0
+
+    # Load the NLP model at startup. When disabled, it is loaded by the first
+    # request that needs it, so pattern-only (fast mode) use never loads it
+    preload_model: bool = True
+
+    # Number of analyzer results kept for repeated texts (0 disables the cache)
+    analyze_cache_size: int = 4096
+
     # Default enabled entity types
     default_entities: list[str] = [
         "PERSON",
@@ -2,18 +2,20 @@
 
 import logging
 import os
+import platform
+from pathlib import Path
 
 import spacy
-
-# Import to register the hf_token_pipe component with spaCy
-import spacy_huggingface_pipelines  # noqa: F401
 from presidio_analyzer.nlp_engine import (
     NerModelConfiguration,
     NlpEngine,
     TransformersNlpEngine,
 )
+from spacy.language import Language
+from spacy_huggingface_pipelines.token_classification import HFTokenPipe
 
 from anonymize_api.core.config import settings
+from anonymize_api.core.engines.spacy_engine import UNUSED_COMPONENTS, get_trimmed_model_path
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +82,209 @@ LABEL_TO_ENTITY = {
 }
 
 
+# File name ORTQuantizer gives the quantized model
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+
+def _get_quantized_model_path(model_name: str) -> Path:
+    """Get the int8-quantized ONNX export of a model, building it on first use.
+
+    The model is exported to ONNX and dynamically quantized to int8 with the
+    config matching the CPU (AVX512-VNNI on x86, NEON dot-product on ARM), so
+    ONNX Runtime can use the int8 dot-product instructions.
+    """
+    cache_path = settings.onnx_cache_dir / model_name.replace("/", "--")
+
+    if (cache_path / QUANTIZED_MODEL_FILE).exists():
+        return cache_path
+
+    try:
+        from optimum.onnxruntime import ORTModelForTokenClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+    except ImportError as e:
+        raise ImportError(
+            "The onnx transformers backend requires optimum[onnxruntime]"
+        ) from e
+
+    logger.info(f"Exporting and quantizing {model_name} to: {cache_path}")
+
+    model = ORTModelForTokenClassification.from_pretrained(model_name, export=True)
+
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        quantization_config = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    else:
+        quantization_config = AutoQuantizationConfig.avx512_vnni(
+            is_static=False, per_channel=False
+        )
+
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantizer.quantize(save_dir=cache_path, quantization_config=quantization_config)
+    model.config.save_pretrained(cache_path)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(cache_path)
+
+    return cache_path
+
+
+def create_ner_pipeline(
+    model_name: str,
+    stride: int,
+    aggregation_strategy: str,
+    backend: str,
+    batch_size: int,
+):
+    """Create the HuggingFace token classification pipeline for NER.
+
+    Args:
+        model_name: The HuggingFace model to load.
+        stride: Overlap between chunks for texts longer than the model input.
+        aggregation_strategy: How sub-word predictions are merged.
+        backend: "pytorch", or "onnx" for the quantized ONNX Runtime model.
+        batch_size: Number of texts per forward pass when given several texts.
+
+    Returns:
+        A transformers TokenClassificationPipeline.
+    """
+    from transformers import AutoTokenizer, pipeline
+
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForTokenClassification
+
+        model_path = _get_quantized_model_path(model_name)
+        return pipeline(
+            task="token-classification",
+            model=ORTModelForTokenClassification.from_pretrained(
+                model_path, file_name=QUANTIZED_MODEL_FILE
+            ),
+            tokenizer=AutoTokenizer.from_pretrained(model_path),
+            aggregation_strategy=aggregation_strategy,
+            stride=stride,
+            batch_size=batch_size,
+        )
+
+    # Same device selection as spacy-huggingface-pipelines: follow thinc
+    try:
+        from thinc.api import get_torch_default_device
+
+        device = get_torch_default_device().index
+        if device is None:
+            device = -1
+    except Exception:
+        device = -1
+
+    return pipeline(
+        task="token-classification",
+        model=model_name,
+        aggregation_strategy=aggregation_strategy,
+        stride=stride,
+        batch_size=batch_size,
+        device=device,
+    )
+
+
+class BucketedTokenPipe(HFTokenPipe):
+    """HFTokenPipe that groups texts of similar length into the same model batch.
+
+    The HuggingFace pipeline pads every batch to its longest text, so mixing
+    short and long texts wastes most of the compute on padding. Sorting each
+    batch by length before inference keeps the padding small.
+    """
+
+    def _get_annotations(self, docs: list) -> list[list[dict]]:
+        order = sorted(range(len(docs)), key=lambda i: len(docs[i].text))
+        outputs = super()._get_annotations([docs[i] for i in order])
+
+        annotations: list[list[dict]] = [[] for _ in docs]
+        for i, output in zip(order, outputs):
+            annotations[i] = output
+        return annotations
+
+
+@Language.factory(
+    "anonymize_token_pipe",
+    default_config={
+        "model": "",
+        "stride": 16,
+        "aggregation_strategy": "simple",
+        "alignment_mode": "expand",
+        "annotate_spans_key": "bert-base-ner",
+        "backend": "pytorch",
+        "batch_size": 16,
+    },
+)
+def make_token_pipe(
+    nlp: Language,
+    name: str,
+    model: str,
+    stride: int,
+    aggregation_strategy: str,
+    alignment_mode: str,
+    annotate_spans_key: str,
+    backend: str,
+    batch_size: int,
+) -> HFTokenPipe:
+    """spaCy factory for the NER component, using our own HuggingFace pipeline."""
+    return BucketedTokenPipe(
+        name=name,
+        hf_pipeline=create_ner_pipeline(
+            model, stride, aggregation_strategy, backend, batch_size
+        ),
+        annotate="spans",
+        annotate_spans_key=annotate_spans_key,
+        alignment_mode=alignment_mode,
+    )
+
+
+class AnonymizeTransformersNlpEngine(TransformersNlpEngine):
+    """TransformersNlpEngine with a configurable NER inference backend.
+
+    Presidio's engine always builds a PyTorch pipeline from the model name.
+    This variant keeps its spaCy tokenization and span alignment, but adds
+    the NER component through ``anonymize_token_pipe`` so the model can also
+    run on ONNX Runtime, and lets ``settings.gpu`` override device detection.
+    """
+
+    def _enable_gpu(self) -> None:
+        """Move spaCy and the NER pipeline to the GPU as configured.
+
+        The NER pipeline follows thinc's default device, so once spaCy is on
+        the GPU the HuggingFace model is placed there as well.
+        """
+        if settings.gpu is None:
+            super()._enable_gpu()
+        elif settings.gpu:
+            spacy.require_gpu()
+            logger.info("Running transformers engine on GPU")
+
+    def load(self) -> None:
+        """Load the spaCy and transformers models."""
+        self._enable_gpu()
+
+        self.nlp = {}
+
+        for model in self.models:
+            self._validate_model_params(model)
+            spacy_model = model["model_name"]["spacy"]
+            self._download_spacy_model_if_needed(spacy_model)
+
+            # spaCy only tokenizes and lemmatizes here, the NER comes from the
+            # transformers model, so its own NER isn't even loaded
+            nlp = spacy.load(spacy_model, exclude=[*UNUSED_COMPONENTS, "ner"])
+            nlp.add_pipe(
+                "anonymize_token_pipe",
+                config={
+                    "model": model["model_name"]["transformers"],
+                    "stride": self.ner_model_configuration.stride,
+                    "aggregation_strategy": self.ner_model_configuration.aggregation_strategy,
+                    "alignment_mode": self.ner_model_configuration.alignment_mode,
+                    "annotate_spans_key": self.entity_key,
+                    "backend": settings.transformers_backend,
+                    "batch_size": settings.transformers_batch_size,
+                },
+            )
+            self.nlp[model["lang_code"]] = nlp
+
+
 def create_transformers_engine(language: str = "de") -> NlpEngine:
     """Create a Transformers-based NLP engine using the configured model.
 
@@ -93,18 +298,14 @@ def create_transformers_engine(language: str = "de") -> NlpEngine:
         A configured TransformersNlpEngine.
     """
     model_name = settings.transformers_model
-    logger.info(f"Creating Transformers engine with model: {model_name}")
+    logger.info(
+        f"Creating Transformers engine with model: {model_name} "
+        f"({settings.transformers_backend} backend)"
+    )
 
     # Disable tokenizers parallelism to avoid fork issues
     os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
-    # Ensure the spaCy model is available (needed for tokenization)
-    try:
-        spacy.load(settings.spacy_model)
-    except OSError:
-        logger.info(f"Downloading spaCy model: {settings.spacy_model}")
-        spacy.cli.download(settings.spacy_model)
-
     # Configure the NER model with custom label mapping
     ner_config = NerModelConfiguration(
         model_to_presidio_entity_mapping=LABEL_TO_ENTITY,
@@ -115,12 +316,13 @@ def create_transformers_engine(language: str = "de") -> NlpEngine:
     # Create the TransformersNlpEngine with custom label mapping
     # Uses spaCy for tokenization and transformers model for NER
     # The transformers model will be downloaded automatically by HuggingFace on first use
-    engine = TransformersNlpEngine(
+    engine = AnonymizeTransformersNlpEngine(
         models=[
             {
                 "lang_code": language,
                 "model_name": {
-                    "spacy": settings.spacy_model,
+                    # Downloaded and trimmed on first use, like for the spaCy engine
+                    "spacy": get_trimmed_model_path(),
                     "transformers": model_name,
                 },
             }
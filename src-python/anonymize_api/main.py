@@ -1,7 +1,16 @@
 """FastAPI application entry point."""
 
+import asyncio
+import ctypes
+import gc
+import importlib.util
 import logging
+import multiprocessing
+import os
+import platform
+import signal
 import sys
+import threading
 from contextlib import asynccontextmanager
 
 import uvicorn
@@ -10,7 +19,9 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from anonymize_api import __version__
 from anonymize_api.api.routes import router
-from anonymize_api.core.analyzer import get_analyzer
+from anonymize_api.core.analyzer import get_analyzer, warm_up
+from anonymize_api.core.anonymizer import get_anonymizer
+from anonymize_api.core.batching import analyze_batcher
 from anonymize_api.core.config import settings
 
 # Configure logging
@@ -21,6 +32,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# prctl option from <linux/prctl.h>: signal to receive when the parent dies
+_PR_SET_PDEATHSIG = 1
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -29,18 +43,34 @@ async def lifespan(app: FastAPI):
     logger.info(f"Version: {__version__}")
     logger.info(f"Host: {settings.host}:{settings.port}")
 
-    # Pre-load the analyzer and models
-    logger.info("Loading spaCy model and initializing analyzer...")
-    try:
-        get_analyzer()
-        logger.info("Analyzer initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize analyzer: {e}")
-        raise
+    # Pre-load the analyzer and anonymizer side by side off the event loop,
+    # then run a dummy analysis so the first request does not pay for lazy
+    # initialization
+    if settings.preload_model:
+        logger.info("Loading spaCy model and initializing analyzer...")
+        try:
+            await asyncio.gather(
+                asyncio.to_thread(get_analyzer),
+                asyncio.to_thread(get_anonymizer),
+            )
+            await asyncio.to_thread(warm_up)
+            logger.info("Analyzer initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize analyzer: {e}")
+            raise
+    else:
+        logger.info("Model preloading disabled, loading it on first use")
+
+    await analyze_batcher.start()
+
+    # Spawned workers are multiprocessing children of uvicorn's supervisor
+    if multiprocessing.parent_process() is not None:
+        watch_parent_process()
 
     yield
 
     logger.info("Shutting down Anonymize API...")
+    await analyze_batcher.stop()
 
 
 app = FastAPI(
@@ -68,16 +98,156 @@ app.add_middleware(
 app.include_router(router)
 
 
+def get_server_options() -> dict:
+    """Get uvicorn's event loop and HTTP parser, preferring the C implementations.
+
+    uvicorn[standard] installs uvloop (not available on Windows) and
+    httptools, which are much faster than asyncio's loop and h11. uvicorn's
+    "auto" setting silently falls back when they can't be imported, e.g. when
+    PyInstaller left them out, so they are chosen here and a fallback is logged.
+    """
+    options = {"loop": "asyncio", "http": "h11"}
+
+    if platform.system() != "Windows":
+        if importlib.util.find_spec("uvloop") is not None:
+            options["loop"] = "uvloop"
+        else:
+            logger.warning("uvloop not installed, using the asyncio event loop")
+
+    if importlib.util.find_spec("httptools") is not None:
+        options["http"] = "httptools"
+    else:
+        logger.warning("httptools not installed, using the h11 HTTP parser")
+
+    return options
+
+
 def main():
     """Run the API server."""
+    if settings.workers > 1:
+        # Forking after macOS system frameworks were loaded isn't safe
+        if sys.platform == "linux":
+            run_preforked(settings.workers)
+        else:
+            run_spawned(settings.workers)
+        return
+
     # Use app object directly instead of string import for PyInstaller compatibility
     uvicorn.run(
         app,
         host=settings.host,
         port=settings.port,
         log_level="info",
+        **get_server_options(),
+    )
+
+
+def run_preforked(workers: int) -> None:
+    """Run the API server in several processes that share the loaded models.
+
+    uvicorn's own ``--workers`` starts fresh interpreters, each loading the
+    spaCy/transformers models again. Here the models are loaded once, then
+    the workers are forked and inherit them copy-on-write, so the model
+    memory and load time are paid once instead of per worker.
+
+    The models have to be loaded before the fork to be shared. The garbage
+    collector is kept off meanwhile, and everything loaded is frozen right
+    before forking: otherwise collections in the workers write to the
+    objects' GC headers, and the pages holding them get copied anyway.
+    """
+    gc.disable()
+    if settings.preload_model:
+        logger.info(f"Loading models before starting {workers} workers...")
+        get_analyzer()
+        get_anonymizer()
+        warm_up()
+
+    config = uvicorn.Config(
+        app,
+        host=settings.host,
+        port=settings.port,
+        log_level="info",
+        **get_server_options(),
+    )
+    sock = config.bind_socket()
+
+    gc.freeze()
+    gc.enable()
+
+    parent_pid = os.getpid()
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            exit_with_parent(parent_pid)
+            uvicorn.Server(config).run(sockets=[sock])
+            os._exit(0)
+        children.append(pid)
+
+    def stop_workers(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop_workers)
+    signal.signal(signal.SIGTERM, stop_workers)
+
+    for pid in children:
+        os.waitpid(pid, 0)
+    sock.close()
+
+
+def exit_with_parent(parent_pid: int) -> None:
+    """Have the kernel stop this forked worker when its parent dies.
+
+    The app stops the server with SIGKILL, which the parent can't forward
+    to its workers; without this they would keep the port open.
+    """
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.prctl(_PR_SET_PDEATHSIG, signal.SIGTERM) != 0:
+        logger.warning(f"Could not tie the worker to its parent: {os.strerror(ctypes.get_errno())}")
+
+    # The parent may have died before the signal was requested
+    if os.getppid() != parent_pid:
+        os._exit(0)
+
+
+def watch_parent_process() -> None:
+    """Shut this spawned worker down when the process that started it dies.
+
+    uvicorn's spawned workers keep serving if the supervisor is killed, so a
+    thread waits for the parent and then stops the server like a SIGTERM.
+    """
+
+    def wait_for_parent():
+        multiprocessing.parent_process().join()
+        logger.info("Parent process exited, shutting down worker")
+        signal.raise_signal(signal.SIGTERM)
+
+    threading.Thread(target=wait_for_parent, name="parent-watchdog", daemon=True).start()
+
+
+def run_spawned(workers: int) -> None:
+    """Run the API server in several freshly started processes.
+
+    Used where processes can't be forked safely (macOS, Windows). uvicorn
+    starts the workers and each one imports the app by name and loads its
+    own models, so memory use and startup time grow with the number of
+    workers.
+    """
+    uvicorn.run(
+        "anonymize_api.main:app",
+        host=settings.host,
+        port=settings.port,
+        log_level="info",
+        workers=workers,
+        **get_server_options(),
     )
 
 
 if __name__ == "__main__":
+    # Lets the PyInstaller binary act as a spawned worker process
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,67 @@
+"""Context enhancement that scales to documents with many matches."""
+
+import threading
+from bisect import bisect_right
+
+from presidio_analyzer.context_aware_enhancers import LemmaContextAwareEnhancer
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+
+class IndexedLemmaContextAwareEnhancer(LemmaContextAwareEnhancer):
+    """LemmaContextAwareEnhancer that finds each match's token by bisection.
+
+    For every result, Presidio walks the tokens from the start of the text to
+    find the one the match starts in, creating a spaCy Token object per step,
+    and looks up each context lemma in the keyword list. Documents with many
+    matches (like postal codes, which rely on context) therefore take time
+    quadratic in their length. Here the token end offsets and the keywords
+    are collected once per text, and each match's token is found by binary
+    search. Context words and scores are exactly Presidio's.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # The NLP artifacts last indexed on this thread, with their token end
+        # offsets and keywords. All results of a text are enhanced in turn
+        self._index = threading.local()
+
+    def _extract_surrounding_words(
+        self,
+        nlp_artifacts: NlpArtifacts,
+        word: str,
+        start: int,
+    ) -> list[str]:
+        """Get the context lemmas before and after the token a match starts in."""
+        if not nlp_artifacts.tokens:
+            return [""]
+
+        token_ends, keywords = self._get_index(nlp_artifacts)
+
+        # Presidio takes the first token that starts at the match or ends
+        # after its start. Tokens don't overlap and aren't empty, so that is
+        # the first token ending after the start
+        token_index = bisect_right(token_ends, start)
+        if token_index == len(token_ends):
+            raise ValueError(
+                f"Did not find word '{word}' in the list of tokens although it "
+                "is expected to be found"
+            )
+
+        context = self._add_n_words_backward(
+            token_index, self.context_prefix_count, nlp_artifacts.lemmas, keywords
+        )
+        context += self._add_n_words_forward(
+            token_index, self.context_suffix_count, nlp_artifacts.lemmas, keywords
+        )
+        return list(set(context))
+
+    def _get_index(self, nlp_artifacts: NlpArtifacts) -> tuple[list[int], frozenset[str]]:
+        """Get the token end offsets and the keyword set of a text's NLP artifacts."""
+        last = getattr(self._index, "last", None)
+        if last is None or last[0] is not nlp_artifacts:
+            token_ends = [
+                index + len(token)
+                for index, token in zip(nlp_artifacts.tokens_indices, nlp_artifacts.tokens)
+            ]
+            last = self._index.last = (nlp_artifacts, token_ends, frozenset(nlp_artifacts.keywords))
+        return last[1], last[2]
@@ -0,0 +1,195 @@
+"""Single-pass Hyperscan matching for pattern recognizers."""
+
+import hashlib
+import logging
+import platform
+import threading
+from pathlib import Path
+from typing import Optional
+
+import hyperscan
+from presidio_analyzer import LocalRecognizer, PatternRecognizer, RecognizerResult
+from presidio_analyzer.context_aware_enhancers import ContextAwareEnhancer
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+logger = logging.getLogger(__name__)
+
+# Same semantics as Presidio's regex flags (DOTALL | MULTILINE | IGNORECASE) on
+# Unicode text. Prefilter mode lets Hyperscan accept constructs it cannot
+# match exactly (such as \b in Unicode mode) by widening them, so a hit only
+# means the pattern may match.
+HYPERSCAN_FLAGS = (
+    hyperscan.HS_FLAG_UTF8
+    | hyperscan.HS_FLAG_UCP
+    | hyperscan.HS_FLAG_CASELESS
+    | hyperscan.HS_FLAG_DOTALL
+    | hyperscan.HS_FLAG_MULTILINE
+    | hyperscan.HS_FLAG_SINGLEMATCH
+    | hyperscan.HS_FLAG_PREFILTER
+)
+
+
+class HyperscanRecognizer(LocalRecognizer):
+    """Run several pattern recognizers behind one Hyperscan database.
+
+    Presidio runs every pattern recognizer's regexes over the whole text
+    separately. Here all their patterns are compiled into one Hyperscan
+    database, so each text is scanned once for all of them, and only the
+    recognizers with a pattern hit run their own regexes to build the
+    results. Matching, scoring, validation and context words therefore stay
+    exactly those of the wrapped recognizers.
+
+    Args:
+        recognizers: Pattern recognizers with one supported entity each.
+        context_enhancer: The analyzer's context enhancer, used to apply
+            each wrapped recognizer's own context words.
+        cache_dir: Where the compiled database is cached between runs, as
+            compiling it takes a large part of the startup time. None
+            compiles it every time.
+    """
+
+    def __init__(
+        self,
+        recognizers: list[PatternRecognizer],
+        context_enhancer: ContextAwareEnhancer,
+        cache_dir: Optional[Path] = None,
+    ) -> None:
+        self.recognizers = recognizers
+        self.context_enhancer = context_enhancer
+        self.cache_dir = cache_dir
+        self._scratch = threading.local()
+
+        super().__init__(
+            supported_entities=[
+                entity for recognizer in recognizers for entity in recognizer.supported_entities
+            ],
+            supported_language=recognizers[0].supported_language,
+        )
+
+    def load(self) -> None:
+        """Compile all patterns of the wrapped recognizers into one database."""
+        expressions = []
+        self._pattern_owners: list[PatternRecognizer] = []
+        for recognizer in self.recognizers:
+            for pattern in recognizer.patterns:
+                expressions.append(pattern.regex.encode("utf-8"))
+                self._pattern_owners.append(recognizer)
+
+        self._database = _load_database(expressions, self.cache_dir)
+
+    def analyze(
+        self,
+        text: str,
+        entities: list[str],
+        nlp_artifacts: Optional[NlpArtifacts] = None,
+    ) -> list[RecognizerResult]:
+        """Scan the text once and run the recognizers whose patterns hit."""
+        matched: set[int] = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            matched.add(pattern_id)
+
+        self._database.scan(
+            text.encode("utf-8"),
+            match_event_handler=on_match,
+            scratch=self._get_scratch(),
+        )
+
+        results = []
+        for recognizer in dict.fromkeys(self._pattern_owners[i] for i in sorted(matched)):
+            if not any(entity in entities for entity in recognizer.supported_entities):
+                continue
+            for result in recognizer.analyze(text, entities, nlp_artifacts):
+                # Presidio only keeps results of registered recognizers
+                result.recognition_metadata[RecognizerResult.RECOGNIZER_IDENTIFIER_KEY] = self.id
+                results.append(result)
+
+        return results
+
+    def enhance_using_context(
+        self,
+        text: str,
+        raw_recognizer_results: list[RecognizerResult],
+        other_raw_recognizer_results: list[RecognizerResult],
+        nlp_artifacts: NlpArtifacts,
+        context: Optional[list[str]] = None,
+    ) -> list[RecognizerResult]:
+        """Boost scores using the context words of the recognizer behind each result."""
+        results = []
+        for recognizer in self.recognizers:
+            recognizer_results = [
+                r for r in raw_recognizer_results if r.entity_type in recognizer.supported_entities
+            ]
+            if not recognizer_results:
+                continue
+
+            # Let the enhancer find the wrapped recognizer and its context words
+            for result in recognizer_results:
+                result.recognition_metadata[RecognizerResult.RECOGNIZER_IDENTIFIER_KEY] = (
+                    recognizer.id
+                )
+
+            enhanced = self.context_enhancer.enhance_using_context(
+                text=text,
+                raw_results=recognizer_results,
+                nlp_artifacts=nlp_artifacts,
+                recognizers=[recognizer],
+                context=context,
+            )
+
+            for result in enhanced:
+                result.recognition_metadata[RecognizerResult.RECOGNIZER_IDENTIFIER_KEY] = self.id
+            results.extend(enhanced)
+
+        return results
+
+    def _get_scratch(self) -> hyperscan.Scratch:
+        """Get this thread's scratch space (scratch can't be shared between threads)."""
+        scratch = getattr(self._scratch, "scratch", None)
+        if scratch is None:
+            scratch = self._scratch.scratch = hyperscan.Scratch(self._database)
+        return scratch
+
+
+def _load_database(expressions: list[bytes], cache_dir: Optional[Path]) -> hyperscan.Database:
+    """Compile the patterns into a database, or load it from the cache.
+
+    Serialized databases are specific to the Hyperscan version and CPU, so
+    they are cached by those and the patterns, and a cached database that
+    fails to load is compiled again.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        key = hashlib.sha256()
+        key.update(f"{hyperscan.__version__}:{platform.machine()}:{HYPERSCAN_FLAGS}".encode())
+        for expression in expressions:
+            key.update(expression + b"\0")
+        cache_path = cache_dir / f"{key.hexdigest()}.hsdb"
+
+        try:
+            return hyperscan.loadb(cache_path.read_bytes(), hyperscan.HS_MODE_BLOCK)
+        except FileNotFoundError:
+            pass
+        except (OSError, hyperscan.error) as e:
+            logger.warning(f"Could not load cached Hyperscan database, compiling it: {e}")
+
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        flags=[HYPERSCAN_FLAGS] * len(expressions),
+    )
+
+    if cache_path is not None:
+        # Write to a temporary file first so an interrupted write never
+        # leaves a truncated database behind
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(hyperscan.dumpb(database))
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache Hyperscan database: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    return database
@@ -1,13 +1,314 @@
 """Swiss-specific entity recognizers for Presidio."""
 
-from presidio_analyzer import Pattern, PatternRecognizer
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Optional
 
+import regex as re
+from presidio_analyzer import EntityRecognizer, Pattern, PatternRecognizer, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpArtifacts
 
-class SwissAHVRecognizer(PatternRecognizer):
+from anonymize_api.recognizers.results import remove_duplicates
+from anonymize_api.recognizers.validators import is_valid_ahv, is_valid_iban
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+logger = logging.getLogger(__name__)
+
+# Longest a regex scan may take before it is given up. Read from the same
+# environment variable as Presidio's own pattern recognizers
+_REGEX_TIMEOUT_SECONDS = int(os.environ.get("REGEX_TIMEOUT_SECONDS", 60))
+
+# re2's \d and \s only match ASCII. These are the Unicode classes the regex
+# module matches for them, so e.g. numbers with non-breaking spaces still match
+_RE2_CLASSES = {
+    r"\d": r"\p{Nd}",
+    r"\s": r"[\t\n\v\f\r \x{1c}-\x{1f}\x{85}\p{Z}]",
+}
+
+_RE2_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+
+# A \b before a character class of ASCII word characters only, like \b[1-9].
+# There it is the same as (?<!\w), which the regex module tests about three
+# times faster at every position it tries. Before a class that can match a
+# non-word character, like [+0], the two differ, and before a literal \b is
+# faster (the literal is searched for first), so both are left alone
+_BOUNDARY_BEFORE_CLASS = re.compile(
+    r"(?<!\\)\\b(?=\[(?:\\d|[0-9A-Za-z_](?:-[0-9A-Za-z_])?)+\])"
+)
+
+# re2's \b only knows ASCII word characters, so next to a non-ASCII one it can
+# see a different word boundary than the regex module. Outside a match that
+# shows up as a match bordering such a character. Inside one it can only be a
+# non-ASCII digit, or a letter matching [A-Z] case-insensitively (long s and the
+# Kelvin sign), and texts containing those are left to the regex module
+_WORD_CHAR = re.compile(r"\w")
+_RE2_AMBIGUOUS_CHAR = (
+    re2.compile(rb"[^\P{Nd}0-9]|[\x{17f}\x{212a}]") if re2 is not None else None
+)
+
+# The last text encoded for re2 on this thread, as (text, UTF-8 or None). All
+# recognizers analyze the same text in turn, so it is only encoded once
+_re2_input = threading.local()
+
+
+def _leading_literal(regex: str) -> str:
+    """Get the first literal a pattern has to match (after a leading \\b)."""
+    body = regex.removeprefix(r"\b")
+    return body[:2] if body.startswith("\\") else body[:1]
+
+
+def _prefers_re2(literal: str) -> bool:
+    """Check if re2 scans for patterns with a leading literal faster than regex.
+
+    The regex module jumps straight to a leading digit or symbol, which beats
+    re2's automaton. Patterns starting with a character class, or letters
+    that have to be matched case-insensitively, it tries at every position.
+    """
+    if literal.startswith("\\"):
+        return literal[1:].isalnum()
+    return literal.isalpha() or literal in "[(."
+
+
+def _to_re2(regex: str, flags: int) -> bytes:
+    """Translate a regex and its flags to a UTF-8 re2 pattern."""
+    # Escaped backslashes are matched first, so "\\d" stays a literal "\d"
+    body = re.sub(r"\\\\|\\[ds]", lambda m: _RE2_CLASSES.get(m.group(), m.group()), regex)
+    inline = "".join(letter for flag, letter in _RE2_INLINE_FLAGS if flags & flag)
+    return f"(?{inline}){body}".encode() if inline else body.encode()
+
+
+@lru_cache(maxsize=None)
+def _compile_scan(literal: str, regex: str, flags: int):
+    """Compile a scan with re2 where it is installed and faster, else with regex.
+
+    Compiled scans are shared by all recognizer instances, and also reused
+    when ``analyze`` is called with other regex flags.
+    """
+    if re2 is not None and _prefers_re2(literal):
+        return re2.compile(_to_re2(regex, flags))
+    return _compile_regex(regex, flags)
+
+
+@lru_cache(maxsize=None)
+def _compile_regex(regex: str, flags: int) -> re.Pattern:
+    """Compile a scan with the regex module (once per process, like scans)."""
+    return re.compile(_BOUNDARY_BEFORE_CLASS.sub(r"(?<!\\w)", regex), flags=flags)
+
+
+def _utf8_for_re2(text: str) -> Optional[bytes]:
+    """Encode a text for re2, or get None if re2 can't match it like regex."""
+    last = getattr(_re2_input, "last", None)
+    if last is not None and last[0] is text:
+        return last[1]
+
+    data = text.encode()
+    if len(data) != len(text) and _RE2_AMBIGUOUS_CHAR.search(data):
+        data = None
+    _re2_input.last = (text, data)
+    return data
+
+
+def _re2_spans(scan, text: str, data: bytes) -> list[tuple[int, int, Optional[str]]]:
+    """Get the character span and group name of every re2 match in UTF-8 data."""
+    # Group names of a bytes pattern are bytes too
+    matches = [
+        (*match.span(), match.lastgroup.decode() if match.lastgroup else None)
+        for match in scan.finditer(data)
+    ]
+    if len(data) == len(text):
+        return matches
+
+    # Map byte offsets to characters. Matches come in order and don't overlap,
+    # so only the bytes since the previous match are decoded. That is cheaper
+    # than an offset table for the whole text (e.g. a cumulative sum over its
+    # lead bytes) unless a scan has hundreds of matches
+    spans = []
+    byte_pos = char_pos = 0
+    for start, end, group in matches:
+        char_start = char_pos + len(data[byte_pos:start].decode())
+        char_pos = char_start + len(data[start:end].decode())
+        byte_pos = end
+        spans.append((char_start, char_pos, group))
+    return spans
+
+
+def _borders_unicode_word(text: str, start: int, end: int) -> bool:
+    """Check if a match is next to a non-ASCII word character."""
+    return any(
+        0 <= i < len(text) and not text[i].isascii() and _WORD_CHAR.match(text, i)
+        for i in (start - 1, end)
+    )
+
+
+class CombinedPatternRecognizer(PatternRecognizer):
+    """PatternRecognizer that matches its pattern variants in combined scans.
+
+    Presidio scans the whole text once per pattern. Here variants starting
+    with the same literal are joined into one alternation of named groups,
+    so the text is scanned once per group of variants, and the group that
+    matched gives the score of the original pattern. Variants with different
+    leading literals stay separate: the regex engine finds a single literal
+    quickly, but has to try every position for an alternation of different
+    ones. Alternatives are ordered by descending score, so where several
+    variants match the same text the most confident one wins, as it would
+    after Presidio's duplicate removal.
+
+    If google-re2 is installed, scans the regex module can't find by a
+    leading literal run on re2 instead: its automata match in time linear in
+    the text length, without backtracking, so no regex timeout is needed.
+    """
+
+    def __init__(
+        self,
+        supported_entity: str,
+        patterns: list[Pattern],
+        context: list[str],
+    ) -> None:
+        super().__init__(
+            supported_entity=supported_entity,
+            patterns=patterns,
+            context=context,
+            supported_language="de",
+        )
+
+        variants: dict[str, list[Pattern]] = {}
+        for pattern in sorted(self.patterns, key=lambda pattern: pattern.score, reverse=True):
+            variants.setdefault(_leading_literal(pattern.regex), []).append(pattern)
+
+        # (leading literal, regex, pattern by group name) per scan. A lone
+        # pattern is used as is, so its match has no group name
+        self._scans: list[tuple[str, str, dict[Optional[str], Pattern]]] = []
+        for literal, same_prefix in variants.items():
+            if len(same_prefix) == 1:
+                self._scans.append((literal, same_prefix[0].regex, {None: same_prefix[0]}))
+                continue
+
+            groups = {f"p{i}": pattern for i, pattern in enumerate(same_prefix)}
+            regex = "|".join(f"(?P<{group}>{pattern.regex})" for group, pattern in groups.items())
+            self._scans.append((literal, regex, groups))
+
+        self._compiled = [
+            _compile_scan(literal, regex, self.global_regex_flags)
+            for literal, regex, _ in self._scans
+        ]
+
+    def analyze(
+        self,
+        text: str,
+        entities: list[str],
+        nlp_artifacts: Optional[NlpArtifacts] = None,
+        regex_flags: Optional[int] = None,
+    ) -> list[RecognizerResult]:
+        """Find all pattern matches with one scan per group of variants."""
+        flags = regex_flags if regex_flags else self.global_regex_flags
+        compiled = self._compiled
+        if flags != self.global_regex_flags:
+            compiled = [_compile_scan(literal, regex, flags) for literal, regex, _ in self._scans]
+
+        results = []
+        for scan, (_, regex, patterns) in zip(compiled, self._scans):
+            for start, end, group in self._find_matches(scan, regex, flags, text):
+                if start == end:
+                    continue
+
+                pattern = patterns[group]
+                result = self._build_result(text[start:end], start, end, pattern, flags)
+                if result is not None and result.score > EntityRecognizer.MIN_SCORE:
+                    results.append(result)
+
+        return remove_duplicates(results)
+
+    def _find_matches(
+        self,
+        scan,
+        regex: str,
+        flags: int,
+        text: str,
+    ) -> list[tuple[int, int, Optional[str]]]:
+        """Get the character span and group name of every match of a scan."""
+        if not isinstance(scan, re.Pattern):
+            data = _utf8_for_re2(text)
+            if data is not None:
+                spans = _re2_spans(scan, text, data)
+                if len(data) == len(text) or not any(
+                    _borders_unicode_word(text, start, end) for start, end, _ in spans
+                ):
+                    return spans
+            # re2 can't match this text like the regex module would (see
+            # _WORD_CHAR). That is rare enough to simply rescan it with regex
+            scan = _compile_regex(regex, flags)
+
+        try:
+            return [
+                (*match.span(), match.lastgroup)
+                for match in scan.finditer(text, timeout=_REGEX_TIMEOUT_SECONDS)
+            ]
+        except TimeoutError:
+            logger.warning(
+                f"Regex for {self.name} timed out after {_REGEX_TIMEOUT_SECONDS} "
+                "seconds, skipping."
+            )
+            return []
+
+    def _build_result(
+        self,
+        matched_text: str,
+        start: int,
+        end: int,
+        pattern: Pattern,
+        flags: int,
+    ) -> Optional[RecognizerResult]:
+        """Build a result for a match, scored and validated like Presidio does.
+
+        Presidio builds a result with the minimum score for a match that fails
+        validation, only to drop it. Here the checks run first, and such a
+        match gets None before any result or explanation is created.
+        """
+        if self.invalidate_result(matched_text):
+            return None
+        validation_result = self.validate_result(matched_text)
+        if validation_result is False:
+            return None
+
+        explanation = self.build_regex_explanation(
+            self.name,
+            pattern.name,
+            pattern.regex,
+            pattern.score,
+            validation_result,
+            flags,
+        )
+        result = RecognizerResult(
+            entity_type=self.supported_entities[0],
+            start=start,
+            end=end,
+            score=pattern.score,
+            analysis_explanation=explanation,
+            recognition_metadata={
+                RecognizerResult.RECOGNIZER_NAME_KEY: self.name,
+                RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: self.id,
+            },
+        )
+
+        if validation_result:
+            result.score = EntityRecognizer.MAX_SCORE
+
+        explanation.score = result.score
+        return result
+
+
+class SwissAHVRecognizer(CombinedPatternRecognizer):
     """Recognizer for Swiss AHV/AVS social security numbers.
 
     Format: 756.XXXX.XXXX.XX (with or without dots)
     The number always starts with 756 (Switzerland country code).
+    The last digit is an EAN-13 check digit, which is validated.
     """
 
     PATTERNS = [
@@ -43,11 +344,14 @@ class SwissAHVRecognizer(PatternRecognizer):
             supported_entity="CH_AHV",
             patterns=self.PATTERNS,
             context=self.CONTEXT,
-            supported_language="de",
         )
 
+    def invalidate_result(self, pattern_text: str) -> bool:
+        """Reject matches with a wrong EAN-13 check digit."""
+        return not is_valid_ahv(pattern_text)
 
-class SwissPhoneRecognizer(PatternRecognizer):
+
+class SwissPhoneRecognizer(CombinedPatternRecognizer):
     """Recognizer for Swiss phone numbers.
 
     Formats:
@@ -97,11 +401,10 @@ class SwissPhoneRecognizer(PatternRecognizer):
             supported_entity="CH_PHONE",
             patterns=self.PATTERNS,
             context=self.CONTEXT,
-            supported_language="de",
         )
 
 
-class SwissPostalCodeRecognizer(PatternRecognizer):
+class SwissPostalCodeRecognizer(CombinedPatternRecognizer):
     """Recognizer for Swiss postal codes (PLZ).
 
     Format: 4 digits, first digit 1-9 (no leading zero)
@@ -133,15 +436,15 @@ class SwissPostalCodeRecognizer(PatternRecognizer):
             supported_entity="CH_POSTAL_CODE",
             patterns=self.PATTERNS,
             context=self.CONTEXT,
-            supported_language="de",
         )
 
 
-class SwissIBANRecognizer(PatternRecognizer):
+class SwissIBANRecognizer(CombinedPatternRecognizer):
     """Recognizer for Swiss IBAN numbers.
 
     Format: CH followed by 2 check digits and 17 alphanumeric characters
     Example: CH93 0076 2011 6238 5295 7
+    The check digits are validated with ISO 7064 mod-97.
     """
 
     PATTERNS = [
@@ -177,15 +480,28 @@ class SwissIBANRecognizer(PatternRecognizer):
             supported_entity="CH_IBAN",
             patterns=self.PATTERNS,
             context=self.CONTEXT,
-            supported_language="de",
         )
 
+    def invalidate_result(self, pattern_text: str) -> bool:
+        """Reject matches with wrong mod-97 check digits."""
+        return not is_valid_iban(pattern_text)
+
 
 def get_swiss_recognizers() -> list[PatternRecognizer]:
-    """Get all Swiss-specific recognizers."""
-    return [
+    """Get all Swiss-specific recognizers.
+
+    The recognizers hold no per-text state, so the same instances are handed
+    to every analyzer instead of being built and compiled again.
+    """
+    return list(_create_swiss_recognizers())
+
+
+@lru_cache(maxsize=1)
+def _create_swiss_recognizers() -> tuple[PatternRecognizer, ...]:
+    """Internal function to create the shared recognizer instances."""
+    return (
         SwissAHVRecognizer(),
         SwissPhoneRecognizer(),
         SwissPostalCodeRecognizer(),
         SwissIBANRecognizer(),
-    ]
+    )
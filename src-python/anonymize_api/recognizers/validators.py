@@ -0,0 +1,33 @@
+"""Checksum validation for Swiss identifiers."""
+
+# IBAN letters count as two-digit numbers (A=10, ..., Z=35)
+_IBAN_LETTER_VALUES = str.maketrans({chr(ord("A") + i): str(10 + i) for i in range(26)})
+
+
+def is_valid_iban(iban: str) -> bool:
+    """Check the ISO 7064 mod-97 check digits of an IBAN.
+
+    The country code and check digits are moved to the end, letters are
+    replaced by their numeric values, and the resulting number must leave a
+    remainder of 1 when divided by 97. The conversion and big-int remainder
+    run in C, so there is no per-digit Python loop.
+
+    The patterns are matched case-insensitively, so they also accept
+    non-ASCII lookalikes such as the Kelvin sign (U+212A) for K. Those have no
+    numeric value, and the IBAN is rejected.
+    """
+    compact = "".join(iban.split()).upper()
+    rearranged = (compact[4:] + compact[:4]).translate(_IBAN_LETTER_VALUES)
+    if not (rearranged.isascii() and rearranged.isdigit()):
+        return False
+    return int(rearranged) % 97 == 1
+
+
+def is_valid_ahv(ahv: str) -> bool:
+    """Check the EAN-13 check digit of an AHV number (756.XXXX.XXXX.XC)."""
+    digits = [int(c) for c in ahv if c.isdecimal()]
+    if len(digits) != 13:
+        return False
+
+    total = sum(digits[0:12:2]) + 3 * sum(digits[1:12:2])
+    return (10 - total % 10) % 10 == digits[12]
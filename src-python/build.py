@@ -7,23 +7,9 @@ import sys
 from pathlib import Path
 
 
-def get_binary_name() -> str:
-    """Get the appropriate binary name for the current platform."""
-    system = platform.system().lower()
-    machine = platform.machine().lower()
-
-    if system == "darwin":
-        if machine == "arm64":
-            return "anonymize-api-aarch64-apple-darwin"
-        return "anonymize-api-x86_64-apple-darwin"
-    elif system == "windows":
-        return "anonymize-api-x86_64-pc-windows-msvc.exe"
-    elif system == "linux":
-        if machine == "aarch64":
-            return "anonymize-api-aarch64-unknown-linux-gnu"
-        return "anonymize-api-x86_64-unknown-linux-gnu"
-    else:
-        return f"anonymize-api-{machine}-{system}"
+# Name of the sidecar directory and the executable inside it. The app bundles
+# the whole directory as a resource and starts the executable from there
+SIDECAR_NAME = "anonymize-api"
 
 
 def main():
@@ -35,8 +21,7 @@ def main():
     # Ensure output directory exists
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    binary_name = get_binary_name()
-    print(f"Building binary: {binary_name}")
+    print(f"Building sidecar: {SIDECAR_NAME}")
 
     # Find spaCy model location
     import spacy
@@ -45,14 +30,22 @@ def main():
     # Path separator for --add-data is different on Windows
     path_sep = ";" if platform.system() == "Windows" else ":"
 
+    # uvloop doesn't support Windows
+    uvloop_imports = []
+    if platform.system() != "Windows":
+        uvloop_imports = ["--hidden-import", "uvloop", "--hidden-import", "uvicorn.loops.uvloop"]
+
     # PyInstaller command
     cmd = [
         sys.executable,
         "-m",
         "PyInstaller",
-        "--onefile",
+        # A directory instead of a single file, so the app doesn't unpack the
+        # whole archive (spaCy model included) to a temp dir on every start
+        "--onedir",
+        "--noconfirm",
         "--name",
-        binary_name.replace(".exe", ""),
+        SIDECAR_NAME,
         "--distpath",
         str(output_dir),
         "--workpath",
@@ -83,6 +76,24 @@ def main():
         "uvicorn.lifespan",
         "--hidden-import",
         "uvicorn.lifespan.on",
+        # C event loop and HTTP parser, which uvicorn only imports if present
+        *uvloop_imports,
+        "--hidden-import",
+        "httptools",
+        "--hidden-import",
+        "uvicorn.protocols.http.httptools_impl",
+        # Swiss pattern pre-scan, imported only on platforms that have it
+        "--hidden-import",
+        "hyperscan",
+        # Linear-time matching of the Swiss patterns
+        "--hidden-import",
+        "re2",
+        # JSON encoding of the analyze/anonymize responses
+        "--hidden-import",
+        "orjson",
+        # Imported by name by the workers uvicorn spawns on Windows
+        "--hidden-import",
+        "anonymize_api.main",
         "--hidden-import",
         "presidio_analyzer",
         "--hidden-import",
@@ -120,7 +131,7 @@ def main():
     result = subprocess.run(cmd, cwd=src_python)
 
     if result.returncode == 0:
-        print(f"\nBinary built successfully: {output_dir / binary_name}")
+        print(f"\nSidecar built successfully: {output_dir / SIDECAR_NAME}")
     else:
         print(f"\nBuild failed with exit code: {result.returncode}")
         sys.exit(1)
@@ -0,0 +1,12 @@
+"""Shared test fixtures."""
+
+import pytest
+import spacy
+
+
+@pytest.fixture(scope="session")
+def blank_model(tmp_path_factory):
+    """A German pipeline without components, so no model download is needed."""
+    path = tmp_path_factory.mktemp("model") / "de_blank"
+    spacy.blank("de").to_disk(path)
+    return path
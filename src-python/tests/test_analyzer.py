@@ -0,0 +1,75 @@
+"""Tests for the analyzer wrapper."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from anonymize_api.core import analyzer
+from anonymize_api.core.cache import AnalyzeCache
+from anonymize_api.core.config import NlpEngineType
+
+
+def test_concurrent_first_use_creates_one_analyzer(monkeypatch):
+    created = []
+
+    def create_analyzer(engine_type):
+        created.append(threading.get_ident())
+        time.sleep(0.05)
+        return object()
+
+    monkeypatch.setattr(analyzer, "_create_analyzer", create_analyzer)
+    monkeypatch.setattr(analyzer, "_ANALYZERS", {})
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        analyzers = list(pool.map(lambda _: analyzer._get_analyzer(NlpEngineType.SPACY), range(4)))
+
+    assert len(created) == 1
+    assert all(a is analyzers[0] for a in analyzers)
+
+
+def test_analyzer_status_reports_loading_and_failures(monkeypatch):
+    monkeypatch.setattr(analyzer, "_ANALYZERS", {})
+    monkeypatch.setattr(analyzer, "_LOAD_ERRORS", {})
+    monkeypatch.setattr(analyzer.settings, "nlp_engine", NlpEngineType.SPACY)
+
+    def fail(engine_type):
+        raise OSError("model not found")
+
+    assert analyzer.get_analyzer_status() == "loading"
+
+    monkeypatch.setattr(analyzer, "_create_analyzer", fail)
+    with pytest.raises(OSError):
+        analyzer.get_analyzer()
+    assert analyzer.get_analyzer_status() == "unhealthy"
+
+    monkeypatch.setattr(analyzer, "_create_analyzer", lambda engine_type: object())
+    analyzer.get_analyzer()
+    assert analyzer.get_analyzer_status() == "healthy"
+
+
+def test_concurrent_analysis_matches_sequential(monkeypatch, blank_model, tmp_path):
+    monkeypatch.setattr(analyzer.settings, "nlp_engine", NlpEngineType.SPACY)
+    monkeypatch.setattr(analyzer.settings, "spacy_model", str(blank_model))
+    monkeypatch.setattr(analyzer.settings, "spacy_cache_dir", tmp_path / "spacy")
+    monkeypatch.setattr(analyzer.settings, "hyperscan_cache_dir", tmp_path / "hyperscan")
+    monkeypatch.setattr(analyzer, "_ANALYZERS", {})
+    monkeypatch.setattr(analyzer, "_LOAD_ERRORS", {})
+    # Without the cache, every call runs the shared pipeline
+    monkeypatch.setattr(analyzer, "analyze_cache", AnalyzeCache(maxsize=0))
+
+    entities = analyzer.resolve_entities(None)
+    texts = [
+        f"Kunde {i} wohnt in {8000 + i} Zürich, Telefon +41 44 123 {i:02d} 67, "
+        f"AHV 756.1234.5678.97, IBAN CH93 0076 2011 6238 5295 7. " * (1 + i % 3)
+        for i in range(32)
+    ]
+
+    def analyze(text):
+        return [r.to_dict() for r in analyzer.analyze_many([text], [entities], [0.0])[0]]
+
+    expected = [analyze(text) for text in texts]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(3):
+            assert list(pool.map(analyze, texts)) == expected
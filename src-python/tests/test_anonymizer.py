@@ -0,0 +1,85 @@
+"""Tests for the anonymizer wrapper."""
+
+import random
+import re
+
+import pytest
+from presidio_analyzer import RecognizerResult
+
+from anonymize_api.core import anonymizer as anonymizer_module
+from anonymize_api.core.anonymizer import (
+    _CAN_REWRITE_SPANS,
+    _blake2b_hash,
+    _create_hash_operator,
+    _rewrite_spans,
+    create_operators,
+    get_anonymizer,
+)
+
+ENTITY_TYPES = ["PERSON", "LOCATION", "CH_IBAN"]
+
+
+def _random_results(rng: random.Random, text: str) -> list[RecognizerResult]:
+    results = []
+    for _ in range(rng.randint(1, 8)):
+        start = rng.randrange(len(text))
+        end = rng.randint(start + 1, min(len(text), start + 12))
+        results.append(
+            RecognizerResult(rng.choice(ENTITY_TYPES), start, end, rng.choice([0.3, 0.6, 0.85]))
+        )
+    return results
+
+
+def test_span_steps_are_available():
+    assert _CAN_REWRITE_SPANS
+
+
+@pytest.mark.parametrize("style", ["replace", "redact"])
+@pytest.mark.parametrize("seed", range(20))
+def test_rewrite_spans_matches_presidio(style, seed):
+    rng = random.Random(seed)
+    anonymizer = get_anonymizer()
+    text = "".join(rng.choice("ab  .\n") for _ in range(rng.randint(5, 60)))
+    results = _random_results(rng, text)
+
+    expected = anonymizer.anonymize(
+        text=text,
+        analyzer_results=results,
+        operators=create_operators(style, ENTITY_TYPES),
+    ).text
+
+    assert _rewrite_spans(anonymizer, text, results, style) == expected
+
+
+def _hash_with(monkeypatch, hash_type: str, text: str) -> str:
+    monkeypatch.setattr(anonymizer_module.settings, "hash_type", hash_type)
+    return get_anonymizer().anonymize(
+        text=text,
+        analyzer_results=[RecognizerResult("PERSON", 0, len(text), 0.85)],
+        operators={"DEFAULT": _create_hash_operator()},
+    ).text
+
+
+def test_blake2b_hash_is_salted():
+    digest = _blake2b_hash("Max Muster")
+
+    assert re.fullmatch(r"[0-9a-f]{64}", digest)
+    assert _blake2b_hash("Max Muster") != digest
+
+
+def test_blake2b_runs_as_custom_operator(monkeypatch):
+    first = _hash_with(monkeypatch, "blake2b", "Max Muster")
+
+    assert re.fullmatch(r"[0-9a-f]{64}", first)
+    assert _hash_with(monkeypatch, "blake2b", "Max Muster") != first
+
+
+@pytest.mark.parametrize("hash_type, length", [("sha256", 64), ("sha512", 128)])
+def test_sha_hashes_use_presidio_operator(monkeypatch, hash_type, length):
+    monkeypatch.setattr(anonymizer_module.settings, "hash_type", hash_type)
+    operator = _create_hash_operator()
+
+    assert operator.operator_name == "hash"
+    assert operator.params == {"hash_type": hash_type}
+    digest = _hash_with(monkeypatch, hash_type, "Max Muster")
+    assert re.fullmatch(rf"[0-9a-f]{{{length}}}", digest)
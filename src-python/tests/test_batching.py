@@ -0,0 +1,60 @@
+"""Tests for the micro-batching of analyze requests."""
+
+import asyncio
+import threading
+
+from anonymize_api.core import batching
+
+
+def _analyze_many(texts, entities, score_thresholds):
+    if "bad" in texts:
+        raise ValueError("bad text")
+    return [[text] for text in texts]
+
+
+def test_failing_text_only_fails_its_request(monkeypatch):
+    monkeypatch.setattr(batching, "analyze_many", _analyze_many)
+
+    async def run():
+        batcher = batching.AnalyzeBatcher(max_batch=8, window=0.01, max_concurrent=2)
+        try:
+            return await asyncio.gather(
+                *(batcher.analyze(text, frozenset(), 0.0) for text in ["a", "bad", "c"]),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.stop()
+
+    first, failed, last = asyncio.run(run())
+
+    assert first == ["a"]
+    assert last == ["c"]
+    assert isinstance(failed, ValueError)
+
+
+def test_stop_fails_unanswered_requests(monkeypatch):
+    release = threading.Event()
+
+    def analyze_many(texts, entities, score_thresholds):
+        release.wait(5)
+        return [[] for _ in texts]
+
+    monkeypatch.setattr(batching, "analyze_many", analyze_many)
+
+    async def run():
+        batcher = batching.AnalyzeBatcher(max_batch=1, window=0.0, max_concurrent=1)
+        requests = [
+            asyncio.create_task(batcher.analyze(text, frozenset(), 0.0)) for text in "abc"
+        ]
+        # "a" is being analyzed, "b" and "c" wait for a free worker
+        await asyncio.sleep(0.05)
+        try:
+            await batcher.stop()
+        finally:
+            release.set()
+        return await asyncio.gather(*requests, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert [str(r) for r in results] == ["batcher stopped"] * 3
+    assert all(isinstance(r, RuntimeError) for r in results)
@@ -0,0 +1,95 @@
+"""Tests for the analyze results cache."""
+
+from types import SimpleNamespace
+
+from presidio_analyzer import RecognizerResult
+
+from anonymize_api.core import analyzer
+from anonymize_api.core.cache import AnalyzeCache
+from anonymize_api.core.config import NlpEngineType
+
+ENTITIES = frozenset({"CH_AHV"})
+
+
+class FakeAnalyzer:
+    """Analyzer that records which texts went through the NLP pipeline."""
+
+    def __init__(self):
+        self.processed = []
+        self.nlp_engine = SimpleNamespace(process_batch=self.process_batch)
+
+    def process_batch(self, texts, language, batch_size):
+        self.processed.extend(texts)
+        return [(text, None) for text in texts]
+
+    def analyze(self, text, entities, language, score_threshold, nlp_artifacts):
+        return [RecognizerResult("CH_AHV", 0, len(text), 0.9)]
+
+
+def _use_fake_analyzer(monkeypatch, maxsize=8):
+    fake = FakeAnalyzer()
+    monkeypatch.setattr(analyzer, "get_analyzer", lambda: fake)
+    monkeypatch.setattr(analyzer, "analyze_cache", AnalyzeCache(maxsize))
+    return fake
+
+
+def test_repeated_text_is_served_from_the_cache(monkeypatch):
+    fake = _use_fake_analyzer(monkeypatch)
+
+    first = analyzer.analyze_many(["AHV 756"], [ENTITIES], [0.5])
+    second = analyzer.analyze_many(["AHV 756"], [ENTITIES], [0.5])
+
+    assert fake.processed == ["AHV 756"]
+    assert [r.to_dict() for r in second[0]] == [r.to_dict() for r in first[0]]
+    assert analyzer.analyze_cache.stats()["hits"] == 1
+
+    # Callers get their own list, the cached entry stays as it was
+    second[0].clear()
+    assert len(analyzer.analyze_many(["AHV 756"], [ENTITIES], [0.5])[0]) == 1
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    fake = _use_fake_analyzer(monkeypatch, maxsize=2)
+
+    analyzer.analyze_many(["a", "b"], [ENTITIES] * 2, [0.5] * 2)
+    analyzer.analyze_many(["a"], [ENTITIES], [0.5])  # "b" is now the oldest
+    analyzer.analyze_many(["c"], [ENTITIES], [0.5])
+    analyzer.analyze_many(["a", "b"], [ENTITIES] * 2, [0.5] * 2)
+
+    assert fake.processed == ["a", "b", "c", "b"]
+    assert analyzer.analyze_cache.stats()["size"] == 2
+
+
+def test_key_separates_entities_threshold_and_engine(monkeypatch):
+    key = AnalyzeCache.key("text", ENTITIES, 0.5)
+
+    assert AnalyzeCache.key("text", ENTITIES, 0.5) == key
+    assert AnalyzeCache.key("text", frozenset({"CH_IBAN"}), 0.5) != key
+    assert AnalyzeCache.key("text", ENTITIES, 0.6) != key
+
+    monkeypatch.setattr(analyzer.settings, "nlp_engine", NlpEngineType.TRANSFORMERS)
+    assert AnalyzeCache.key("text", ENTITIES, 0.5) != key
+
+
+def test_lone_surrogates_can_be_cached():
+    cache = AnalyzeCache(maxsize=2)
+    key = cache.key("\ud800 756", ENTITIES, 0.5)
+
+    cache.put(key, [])
+
+    assert cache.get(key) == []
+    assert cache.key("\udc00 756", ENTITIES, 0.5) != key
+
+
+def test_switching_engine_clears_the_cache(monkeypatch):
+    monkeypatch.setattr(analyzer.settings, "nlp_engine", NlpEngineType.SPACY)
+    monkeypatch.setattr(analyzer, "_ANALYZERS", {})
+    monkeypatch.setattr(analyzer, "_LOAD_ERRORS", {})
+    monkeypatch.setattr(analyzer, "_current_engine_type", None)
+    monkeypatch.setattr(analyzer, "_create_analyzer", lambda engine_type: object())
+    monkeypatch.setattr(analyzer, "analyze_cache", AnalyzeCache(maxsize=2))
+    analyzer.analyze_cache.put(AnalyzeCache.key("text", ENTITIES, 0.5), [])
+
+    analyzer.switch_engine(NlpEngineType.TRANSFORMERS)
+
+    assert analyzer.analyze_cache.stats()["size"] == 0
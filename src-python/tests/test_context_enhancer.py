@@ -0,0 +1,90 @@
+"""Tests for the context enhancer against Presidio's."""
+
+import copy
+import random
+
+import pytest
+import spacy
+from presidio_analyzer.context_aware_enhancers import LemmaContextAwareEnhancer
+from presidio_analyzer.nlp_engine import NlpArtifacts, SpacyNlpEngine
+
+from anonymize_api.recognizers.context_enhancer import IndexedLemmaContextAwareEnhancer
+from anonymize_api.recognizers.swiss import get_swiss_recognizers
+
+WORDS = [
+    "Die",
+    "Postleitzahl",
+    "PLZ",
+    "8001",
+    "Zürich",
+    "Tel.",
+    "044 123 45 67",
+    "AHV",
+    "756.1234.5678.97",
+    "Kontonummer",
+    "IBAN",
+    "CH93 0076 2011 6238 5295 7",
+    "3000",
+    "wohnt",
+    "in",
+    ",",
+    ".",
+    "Telefon",
+    "+41 79 123 45 67",
+    "Ort",
+    "Bern",
+    "\n",
+    "  ",
+    "PLZ:8004",
+    "Hans",
+    "Müller",
+]
+
+
+@pytest.fixture(scope="module")
+def nlp_engine():
+    """A spaCy engine without a trained model; lemmas are the lowercased tokens."""
+    engine = SpacyNlpEngine(models=[{"lang_code": "de", "model_name": "blank"}])
+    engine.nlp = {"de": spacy.blank("de")}
+    return engine
+
+
+def _nlp_artifacts(nlp_engine, text: str) -> NlpArtifacts:
+    doc = nlp_engine.nlp["de"](text)
+    return NlpArtifacts(
+        entities=[],
+        tokens=doc,
+        tokens_indices=[token.idx for token in doc],
+        lemmas=[token.text.lower() for token in doc],
+        nlp_engine=nlp_engine,
+        language="de",
+    )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_enhancement_matches_presidio(nlp_engine, seed):
+    rng = random.Random(seed)
+    recognizers = get_swiss_recognizers()
+    indexed = IndexedLemmaContextAwareEnhancer()
+    reference = LemmaContextAwareEnhancer()
+
+    for _ in range(100):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 60)))
+        nlp_artifacts = _nlp_artifacts(nlp_engine, text)
+        context = rng.choice([None, ["wohnort"], ["telefon", "plz"]])
+        results = [
+            result
+            for recognizer in recognizers
+            for result in recognizer.analyze(text, recognizer.supported_entities)
+        ]
+
+        enhanced = indexed.enhance_using_context(
+            text, copy.deepcopy(results), nlp_artifacts, recognizers, context
+        )
+        expected = reference.enhance_using_context(
+            text, copy.deepcopy(results), nlp_artifacts, recognizers, context
+        )
+
+        assert [(r.entity_type, r.start, r.end, r.score) for r in enhanced] == [
+            (r.entity_type, r.start, r.end, r.score) for r in expected
+        ], repr(text)
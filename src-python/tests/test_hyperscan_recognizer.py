@@ -0,0 +1,68 @@
+"""Tests for the shared Hyperscan scan of the Swiss recognizers."""
+
+import random
+
+import pytest
+from presidio_analyzer.context_aware_enhancers import LemmaContextAwareEnhancer
+
+from anonymize_api.recognizers.swiss import get_swiss_recognizers
+
+# Hyperscan has no wheels for every platform
+HyperscanRecognizer = pytest.importorskip(
+    "anonymize_api.recognizers.hyperscan_recognizer"
+).HyperscanRecognizer
+
+FRAGMENTS = [
+    "756.1234.5678.97",
+    "756 1234 5678 97",
+    "+41 79 123 45 67",
+    "044 123 45 67",
+    "8001",
+    "CH93 0076 2011 6238 5295 7",
+    "ch9300762011623852957",
+    "Zürich",
+    " ",
+    "\n",
+    "x",
+    "1",
+    "\xa0",
+    "\u212a",
+]
+
+
+def _key(results):
+    return sorted((r.entity_type, r.start, r.end, r.score) for r in results)
+
+
+def test_matches_wrapped_recognizers(tmp_path):
+    recognizers = get_swiss_recognizers()
+    entities = [entity for r in recognizers for entity in r.supported_entities]
+    rng = random.Random(0)
+
+    # Compiled, then loaded from the cache
+    for _ in range(2):
+        combined = HyperscanRecognizer(recognizers, LemmaContextAwareEnhancer(), tmp_path)
+
+        for _ in range(2000):
+            text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 8)))
+            expected = [
+                result
+                for recognizer in recognizers
+                for result in recognizer.analyze(text, entities)
+            ]
+            assert _key(combined.analyze(text, entities)) == _key(expected), repr(text)
+
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_corrupt_cache_is_rebuilt(tmp_path):
+    recognizers = get_swiss_recognizers()
+    HyperscanRecognizer(recognizers, LemmaContextAwareEnhancer(), tmp_path)
+    (cached,) = tmp_path.iterdir()
+    cached.write_bytes(b"not a database")
+
+    combined = HyperscanRecognizer(recognizers, LemmaContextAwareEnhancer(), tmp_path)
+
+    assert _key(combined.analyze("AHV 756.1234.5678.97", ["CH_AHV"])) == [
+        ("CH_AHV", 4, 20, 0.95)
+    ]
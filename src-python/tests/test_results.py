@@ -0,0 +1,36 @@
+"""Tests for the post-processing of recognizer results."""
+
+import random
+
+import pytest
+from presidio_analyzer import EntityRecognizer, RecognizerResult
+
+from anonymize_api.recognizers.results import remove_duplicates
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_remove_duplicates_matches_presidio(seed):
+    rng = random.Random(seed)
+
+    for _ in range(2000):
+        length = rng.choice([5, 20, 100])
+        results = []
+        for _ in range(rng.randint(0, 30)):
+            start = rng.randint(0, length)
+            results.append(
+                RecognizerResult(
+                    rng.choice("AB"),
+                    start,
+                    start + rng.randint(0, 10),
+                    rng.choice([0, 0.3, 0.5, 0.85, 1.0]),
+                )
+            )
+        # Equal results, which are removed as duplicates
+        if results and rng.random() < 0.3:
+            results += rng.sample(results, min(3, len(results)))
+
+        expected = EntityRecognizer.remove_duplicates(list(results))
+        kept = remove_duplicates(list(results))
+
+        assert len(kept) == len(expected)
+        assert all(a is b for a, b in zip(kept, expected))
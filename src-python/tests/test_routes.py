@@ -0,0 +1,108 @@
+"""Tests for the API routes, run against a blank German spaCy model."""
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from anonymize_api.api import routes
+from anonymize_api.api.schemas import (
+    AnalyzeBatchResponse,
+    AnalyzeResponse,
+    AnonymizeResponse,
+    HealthResponse,
+    StatsResponse,
+)
+from anonymize_api.core import analyzer
+from anonymize_api.core.cache import AnalyzeCache
+from anonymize_api.core.config import NlpEngineType
+from anonymize_api.main import app
+
+AHV_TEXT = "AHV 756.1234.5678.97"
+
+
+@pytest.fixture
+def client(monkeypatch, blank_model, tmp_path):
+    # Same as ANONYMIZE_PRELOAD_MODEL=false, on the settings already loaded
+    monkeypatch.setattr(analyzer.settings, "preload_model", False)
+    monkeypatch.setattr(analyzer.settings, "nlp_engine", NlpEngineType.SPACY)
+    monkeypatch.setattr(analyzer.settings, "spacy_model", str(blank_model))
+    monkeypatch.setattr(analyzer.settings, "spacy_cache_dir", tmp_path / "spacy")
+    monkeypatch.setattr(analyzer.settings, "hyperscan_cache_dir", tmp_path / "hyperscan")
+    monkeypatch.setattr(analyzer, "_ANALYZERS", {})
+    monkeypatch.setattr(analyzer, "_LOAD_ERRORS", {})
+    cache = AnalyzeCache(maxsize=16)
+    monkeypatch.setattr(analyzer, "analyze_cache", cache)
+    monkeypatch.setattr(routes, "analyze_cache", cache)
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_health_reports_loading_until_the_model_is_used(client):
+    health = HealthResponse.model_validate(client.get("/health").json())
+    assert (health.status, health.model_loaded) == ("loading", False)
+
+    client.post("/analyze", json={"text": AHV_TEXT})
+
+    health = HealthResponse.model_validate(client.get("/health").json())
+    assert (health.status, health.model_loaded) == ("healthy", True)
+
+
+@pytest.mark.parametrize("fast_mode", [False, True])
+def test_analyze(client, fast_mode):
+    response = client.post(
+        "/analyze", params={"fast_mode": fast_mode}, json={"text": AHV_TEXT}
+    )
+
+    assert response.status_code == 200
+    result = AnalyzeResponse.model_validate(response.json())
+    assert result.text == AHV_TEXT
+    assert [(e.entity_type, e.text, e.start, e.end) for e in result.entities] == [
+        ("CH_AHV", "756.1234.5678.97", 4, 20)
+    ]
+    # The fast mode doesn't need the model
+    assert analyzer.is_analyzer_loaded() is not fast_mode
+
+
+def test_analyze_batch_keeps_the_item_order(client):
+    response = client.post(
+        "/analyze_batch",
+        json={"items": [{"text": AHV_TEXT}, {"text": "Nichts zu finden"}]},
+    )
+
+    assert response.status_code == 200
+    result = AnalyzeBatchResponse.model_validate(response.json())
+    assert [r.text for r in result.results] == [AHV_TEXT, "Nichts zu finden"]
+    assert [len(r.entities) for r in result.results] == [1, 0]
+
+
+@pytest.mark.parametrize(
+    "style, expected",
+    [
+        ("replace", r"AHV <CH_AHV>"),
+        ("mask", r"AHV \*{16}"),
+        ("hash", r"AHV [0-9a-f]{64}"),
+        ("redact", r"AHV "),
+    ],
+)
+def test_anonymize(client, style, expected):
+    response = client.post(
+        "/anonymize", json={"text": AHV_TEXT, "anonymization_style": style}
+    )
+
+    assert response.status_code == 200
+    result = AnonymizeResponse.model_validate(response.json())
+    assert result.original_text == AHV_TEXT
+    assert re.fullmatch(expected, result.anonymized_text)
+    assert result.anonymization_style == style
+    assert [e.entity_type for e in result.entities] == ["CH_AHV"]
+
+
+def test_stats_count_cache_hits(client):
+    for _ in range(2):
+        client.post("/analyze", json={"text": AHV_TEXT})
+
+    stats = StatsResponse.model_validate(client.get("/stats").json())
+
+    assert (stats.hits, stats.misses, stats.size, stats.maxsize) == (1, 1, 1, 16)
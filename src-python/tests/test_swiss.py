@@ -0,0 +1,143 @@
+"""Tests for the Swiss recognizers against Presidio's own pattern matching."""
+
+import random
+
+import pytest
+from presidio_analyzer import Pattern, PatternRecognizer
+
+from anonymize_api.recognizers import swiss
+
+# Numbers in each format, valid and not, and characters the regex engines
+# treat differently: non-ASCII digits, spaces and word characters, and the
+# long s and Kelvin sign, which match s and k case-insensitively
+FRAGMENTS = [
+    "756.1234.5678.97",
+    "7561234567897",
+    "756 1234 5678 97",
+    "756.1234.5678.90",
+    "+41 79 123 45 67",
+    "+41791234567",
+    "044 123 45 67",
+    "0441234567",
+    "8001",
+    "12345",
+    "CH93 0076 2011 6238 5295 7",
+    "CH9300762011623852957",
+    "ch93 0076 2011 6238 5295 7",
+    "CH2200762KBCD12345678",
+    "Zürich",
+    " ",
+    "\n",
+    ".",
+    "_",
+    "x",
+    "0",
+    "1",
+    "ä",
+    "ß",
+    "é😀",
+    "\xa0",
+    "\u2009",
+    "\u0085",
+    "\u0663",
+    "\u00b2",
+    "\u0301",
+    "\u017f",
+    "\u212a",
+]
+
+RECOGNIZER_CLASSES = [
+    swiss.SwissAHVRecognizer,
+    swiss.SwissPhoneRecognizer,
+    swiss.SwissPostalCodeRecognizer,
+    swiss.SwissIBANRecognizer,
+]
+
+
+def _presidio_recognizer(recognizer: PatternRecognizer) -> PatternRecognizer:
+    """Build a plain PatternRecognizer with the same patterns and checks."""
+    reference = PatternRecognizer(
+        supported_entity=recognizer.supported_entities[0],
+        patterns=[Pattern(p.name, p.regex, p.score) for p in recognizer.patterns],
+        context=recognizer.context,
+        supported_language="de",
+    )
+    reference.invalidate_result = recognizer.invalidate_result
+    reference.validate_result = recognizer.validate_result
+    return reference
+
+
+def _key(results):
+    return sorted((r.entity_type, r.start, r.end, r.score) for r in results)
+
+
+@pytest.fixture(params=["re2", "regex"])
+def engine(request, monkeypatch):
+    """Run a test with re2 matching (where installed) and without."""
+    if request.param == "re2":
+        pytest.importorskip("re2")
+    else:
+        monkeypatch.setattr(swiss, "re2", None)
+    swiss._compile_scan.cache_clear()
+    yield request.param
+    swiss._compile_scan.cache_clear()
+
+
+@pytest.mark.parametrize("recognizer_class", RECOGNIZER_CLASSES)
+def test_matches_presidio(engine, recognizer_class):
+    recognizer = recognizer_class()
+    reference = _presidio_recognizer(recognizer)
+    rng = random.Random(recognizer_class.__name__)
+
+    for _ in range(3000):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 8)))
+        entities = recognizer.supported_entities
+        assert _key(recognizer.analyze(text, entities)) == _key(
+            reference.analyze(text, entities)
+        ), repr(text)
+
+
+@pytest.mark.parametrize(
+    "regex",
+    [
+        r"\b[1-9]\d{3}\b",
+        r"\bCH\d{2}\b",
+        r"\b756\d{10}\b",
+        r"x\\b[1-9]",
+        r"\b[+0]4\d",
+        r"\b[^a-z]\d",
+    ],
+)
+def test_compile_regex_keeps_word_boundaries(regex):
+    compiled = swiss._compile_regex(regex, swiss.re.IGNORECASE)
+    reference = swiss.re.compile(regex, flags=swiss.re.IGNORECASE)
+    rng = random.Random(regex)
+
+    for _ in range(500):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 6)))
+        assert [m.span() for m in compiled.finditer(text)] == [
+            m.span() for m in reference.finditer(text)
+        ], repr(text)
+
+
+@pytest.mark.parametrize(
+    "regex, rewritten",
+    [
+        (r"\b[1-9]\d{3}", True),
+        (r"\b[A-Fa-f0-9_]", True),
+        (r"\b[\d]", True),
+        (r"\b[+0]41", False),
+        (r"\b[^0-9]", False),
+        (r"\b[a-z.]", False),
+    ],
+)
+def test_compile_regex_only_rewrites_word_classes(regex, rewritten):
+    pattern = swiss._compile_regex(regex, 0).pattern
+
+    assert pattern.startswith(r"(?<!\w)") is rewritten
+
+
+def test_recognizers_are_shared():
+    assert all(
+        a is b for a, b in zip(swiss.get_swiss_recognizers(), swiss.get_swiss_recognizers())
+    )
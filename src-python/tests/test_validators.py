@@ -0,0 +1,60 @@
+"""Tests for the Swiss checksum validators."""
+
+import pytest
+
+from anonymize_api.core.analyzer import analyze_patterns
+from anonymize_api.recognizers.validators import is_valid_ahv, is_valid_iban
+
+KELVIN_SIGN = "\u212a"
+
+
+@pytest.mark.parametrize(
+    "iban",
+    [
+        "CH93 0076 2011 6238 5295 7",
+        "CH9300762011623852957",
+        "CH2200762KBCD12345678",
+        "ch2200762kbcd12345678",
+    ],
+)
+def test_valid_iban(iban):
+    assert is_valid_iban(iban)
+
+
+@pytest.mark.parametrize(
+    "iban",
+    [
+        "CH93 0076 2011 6238 5295 8",
+        "CH39 0076 2011 6238 5295 7",
+        "CH2200762KBCD12345679",
+        # Matched by the case-insensitive patterns, but not valid IBANs
+        f"CH2200762{KELVIN_SIGN}BCD12345678",
+        f"CH93 {KELVIN_SIGN}BCD 2011 6238 5295 7",
+        "CH93 ٠٠٧٦ 2011 6238 5295 7",
+    ],
+)
+def test_invalid_iban(iban):
+    assert not is_valid_iban(iban)
+
+
+@pytest.mark.parametrize("ahv", ["756.1234.5678.97", "7561234567897", "756.9217.0769.85"])
+def test_valid_ahv(ahv):
+    assert is_valid_ahv(ahv)
+
+
+@pytest.mark.parametrize(
+    "ahv",
+    [
+        "756.1234.5678.98",
+        "756.1234.5678.9",
+        "756.1234.5678.977",
+        "756.1234.5678.9١",
+    ],
+)
+def test_invalid_ahv(ahv):
+    assert not is_valid_ahv(ahv)
+
+
+def test_lookalike_letters_are_not_detected():
+    text = f"Konto: CH93 {KELVIN_SIGN}BCD 2011 6238 5295 7"
+    assert analyze_patterns(text, frozenset({"CH_IBAN"}), 0.0) == []
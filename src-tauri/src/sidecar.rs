@@ -3,11 +3,14 @@
 use serde::{Deserialize, Serialize};
 use std::sync::atomic::{AtomicBool, Ordering};
 use std::sync::Mutex;
-use tauri::AppHandle;
+use tauri::{AppHandle, Manager};
 use tauri_plugin_shell::process::CommandChild;
 use tauri_plugin_shell::ShellExt;
 use tokio::time::{sleep, Duration};
 
+/// Name of the bundled sidecar directory and of the executable inside it.
+const SIDECAR_NAME: &str = "anonymize-api";
+
 /// The port the sidecar API runs on.
 const SIDECAR_PORT: u16 = 14200;
 
@@ -43,14 +46,48 @@ pub async fn start_sidecar(app: &AppHandle) -> Result<(), String> {
 
     println!("Starting anonymize-api sidecar...");
 
+    // The sidecar is bundled as a directory (PyInstaller --onedir) in the
+    // resources, so it starts without unpacking itself to a temp dir first
+    let sidecar_dir = app
+        .path()
+        .resource_dir()
+        .map_err(|e| format!("Failed to resolve the resource directory: {}", e))?
+        .join(SIDECAR_NAME);
+    let sidecar_path =
+        sidecar_dir.join(format!("{}{}", SIDECAR_NAME, std::env::consts::EXE_SUFFIX));
+    if !sidecar_path.exists() {
+        return Err(format!(
+            "Failed to create sidecar command: {} not found. \
+            The sidecar binary '{}' may be missing from the installation.",
+            sidecar_path.display(),
+            SIDECAR_NAME
+        ));
+    }
+
+    // Resources are bundled as data files, so make sure the executable bit
+    // survived the copy instead of failing later with a bare EACCES
+    #[cfg(unix)]
+    {
+        use std::os::unix::fs::PermissionsExt;
+        let mode = std::fs::metadata(&sidecar_path)
+            .map(|metadata| metadata.permissions().mode())
+            .unwrap_or(0);
+        if mode & 0o111 == 0 {
+            return Err(format!(
+                "Failed to create sidecar command: {} is not executable. \
+                The installation may be damaged; try reinstalling the application.",
+                sidecar_path.display()
+            ));
+        }
+    }
+
     let shell = app.shell();
+    // The app waits for the model at startup, so the sidecar must load it
+    // right away even if preloading was turned off in the environment
     let sidecar = shell
-        .sidecar("anonymize-api")
-        .map_err(|e| format!(
-            "Failed to create sidecar command: {}. \
-            The sidecar binary 'anonymize-api' may be missing from the installation.",
-            e
-        ))?;
+        .command(sidecar_path)
+        .current_dir(sidecar_dir)
+        .env("ANONYMIZE_PRELOAD_MODEL", "true");
 
     let (mut rx, child) = sidecar.spawn().map_err(|e| {
         format!(
@@ -128,10 +165,17 @@ async fn wait_for_health() -> Result<(), String> {
 
     while start.elapsed() < timeout {
         match check_health_internal(&url).await {
-            Ok(health) if health.model_loaded => {
+            Ok(health) if health.status == "healthy" => {
                 println!("Sidecar is healthy (version: {})", health.version);
                 return Ok(());
             }
+            Ok(health) if health.status == "unhealthy" => {
+                return Err(
+                    "Backend service failed to load the language model. \
+                    The installation may be incomplete (spaCy model missing)."
+                        .to_string(),
+                );
+            }
             Ok(_) => {
                 println!("Sidecar responding but model not yet loaded...");
             }
@@ -221,7 +265,7 @@ pub async fn check_backend_health() -> Result<BackendStatus, String> {
     match check_health_internal(&url).await {
         Ok(health) => Ok(BackendStatus {
             running: SIDECAR_RUNNING.load(Ordering::SeqCst),
-            healthy: health.model_loaded,
+            healthy: health.status == "healthy",
             url: format!("http://127.0.0.1:{}", SIDECAR_PORT),
         }),
         Err(_) => Ok(BackendStatus {
@@ -54,7 +54,7 @@ export interface EntitiesResponse {
 }
 
 export interface HealthResponse {
-  status: string;
+  status: "healthy" | "loading" | "unhealthy";
   model_loaded: boolean;
   version: string;
 }